@@ -4,14 +4,19 @@ Implementa diferentes estratégias de estimativa de custo e avaliação.
 """
 
 import math
+import weakref
+from collections import deque
 from nucleo.graph import TipoTerreno
 
 
+# Custo mínimo global dos tipos de terreno, avaliado uma única vez no import.
+# Evita percorrer o enum a cada avaliação de heurística e mantém a admissibilidade.
+_CUSTO_MIN_TERRENO = min(tipo.custo for tipo in TipoTerreno)
+
+
 def _custo_minimo_terreno(grafo=None):
     """Retorna o menor custo de terreno conhecido."""
-    # OTIMIZAÇÃO: Retorna o custo mínimo global dos tipos de terreno
-    # Isso evita percorrer todos os nós do grafo (lento) e mantém a heurística admissível
-    return min(tipo.custo for tipo in TipoTerreno)
+    return _CUSTO_MIN_TERRENO
 
 def distancia_manhattan(no_atual, objetivo):
     """
@@ -60,9 +65,8 @@ def heuristica_terreno(no_atual, objetivo, grafo=None):
     
     if distancia_base == 0:
         return 0
-     
-    custo_minimo = _custo_minimo_terreno(grafo)
-    return distancia_base * custo_minimo
+
+    return distancia_base * _CUSTO_MIN_TERRENO
 
 
 def avaliar_recompensas_proximas(no_atual, objetivo, recompensas, raio=3):
@@ -82,15 +86,19 @@ def avaliar_recompensas_proximas(no_atual, objetivo, recompensas, raio=3):
         return 0
     
     bonus_total = 0
-    distancia_direta = distancia_manhattan(no_atual, objetivo)
-    
+    # Coordenadas locais + abs inline evitam uma chamada de função por recompensa
+    x, y = no_atual.x, no_atual.y
+    obj_x, obj_y = objetivo.x, objetivo.y
+    distancia_direta = abs(x - obj_x) + abs(y - obj_y)
+
     for recompensa in recompensas:
         # Pula recompensas já coletadas
         if recompensa.recompensa_coletada:
             continue
-            
-        dist_para_recompensa = distancia_manhattan(no_atual, recompensa)
-        dist_recompensa_objetivo = distancia_manhattan(recompensa, objetivo)
+
+        dist_para_recompensa = abs(x - recompensa.x) + abs(y - recompensa.y)
+        dist_recompensa_objetivo = (abs(recompensa.x - obj_x)
+                                    + abs(recompensa.y - obj_y))
         
         # Se a recompensa está próxima (dentro do raio)
         if dist_para_recompensa <= raio:
@@ -149,17 +157,19 @@ def heuristica_gulosa_agressiva(no_atual, objetivo, grafo=None, recompensas=None
         float: Custo heurístico agressivo
     """
     h_base = distancia_manhattan(no_atual, objetivo)
-    
+
     if not recompensas:
         return h_base
-    
+
     # Encontra a recompensa mais próxima não coletada
+    # (abs inline: uma chamada de função a menos por recompensa avaliada)
+    x, y = no_atual.x, no_atual.y
     recompensa_mais_proxima = None
     menor_distancia = float('inf')
-    
+
     for recompensa in recompensas:
         if not recompensa.recompensa_coletada:
-            dist = distancia_manhattan(no_atual, recompensa)
+            dist = abs(x - recompensa.x) + abs(y - recompensa.y)
             if dist < menor_distancia:
                 menor_distancia = dist
                 recompensa_mais_proxima = recompensa
@@ -172,6 +182,79 @@ def heuristica_gulosa_agressiva(no_atual, objetivo, grafo=None, recompensas=None
     return h_base
 
 
+def _bfs_multi_origem_grade(largura, altura, origens):
+    """
+    Calcula a distância Manhattan mínima de cada célula até um conjunto de origens
+
+    Faz uma única BFS multi-origem sobre a grade completa (sem paredes), onde a
+    distância BFS equivale à distância Manhattan até a origem mais próxima.
+
+    Args:
+        largura, altura (int): Dimensões da grade
+        origens (list): Nós de origem (usam apenas .x e .y)
+
+    Returns:
+        list: Tabela onde tabela[y * largura + x] é a menor distância Manhattan
+    """
+    infinito = float('inf')
+    distancias = [infinito] * (largura * altura)
+    fila = deque()
+
+    for origem in origens:
+        pos = origem.y * largura + origem.x
+        distancias[pos] = 0
+        fila.append((origem.x, origem.y))
+
+    while fila:
+        x, y = fila.popleft()
+        dist_proxima = distancias[y * largura + x] + 1
+        for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= nx < largura and 0 <= ny < altura:
+                pos = ny * largura + nx
+                if dist_proxima < distancias[pos]:
+                    distancias[pos] = dist_proxima
+                    fila.append((nx, ny))
+
+    return distancias
+
+
+def precalcular_heuristica_gulosa(grafo, objetivo, recompensas):
+    """
+    Precalcula a heurística gulosa agressiva de todos os nós para um objetivo fixo
+
+    Equivale a heuristica_gulosa_agressiva(no, objetivo, grafo, recompensas)
+    para cada nó, mas a varredura linear das recompensas por chamada é trocada
+    por uma única BFS multi-origem a partir das recompensas não coletadas.
+
+    Args:
+        grafo (Graph): Grafo do ambiente
+        objetivo (No): Nó objetivo fixo da busca
+        recompensas (list): Lista de nós com recompensas
+
+    Returns:
+        list: Tabela onde tabela[no.idx] é o valor heurístico do nó
+    """
+    nos_ordenados, _, _, _, _ = grafo.construir_indice_plano()
+    dist_objetivo = precalcular_manhattan_objetivo(grafo, objetivo)
+
+    ativas = [r for r in (recompensas or []) if not r.recompensa_coletada]
+    if not ativas:
+        return dist_objetivo
+
+    largura = grafo.largura
+    dist_recompensa = _bfs_multi_origem_grade(largura, grafo.altura, ativas)
+
+    tabela = []
+    for i, no in enumerate(nos_ordenados):
+        menor_distancia = dist_recompensa[no.y * largura + no.x]
+        # Mesma regra da heurística agressiva: recompensa próxima domina
+        if menor_distancia <= 3:
+            tabela.append(menor_distancia * 0.5)
+        else:
+            tabela.append(dist_objetivo[i])
+    return tabela
+
+
 def calcular_fator_terreno_caminho(caminho, grafo):
     """
     Calcula o fator médio de terreno de um caminho
@@ -185,11 +268,10 @@ def calcular_fator_terreno_caminho(caminho, grafo):
     """
     if not caminho:
         return 1.0
-    
-    soma_custos = 0
-    for no in caminho:
-        soma_custos += no.tipo_terreno.custo
-    
+
+    # sum() sobre generator mantém o laço em nível C, sem índice manual;
+    # no.custo é o valor materializado no nó, sem passar pelo Enum
+    soma_custos = sum(no.custo for no in caminho)
     return soma_custos / len(caminho)
 
 
@@ -210,41 +292,89 @@ def estimar_custo_restante(no_atual, objetivo, grafo):
     if distancia == 0:
         return 0
     
-    # Calcula custo médio dos terrenos no grafo
-    todos_nos = grafo.obter_todos_nos()
-    custo_total = sum(no.tipo_terreno.custo for no in todos_nos)
-    custo_medio = custo_total / len(todos_nos)
-    
+    # Custo médio dos terrenos memoizado no próprio grafo
+    custo_medio = grafo.obter_custo_medio_terreno()
+
     # Estima custo baseado na distância e custo médio
     return distancia * custo_medio
 
 
-# Cache para otimizar cálculos repetidos
-_cache_distancias = {}
+# As tabelas por objetivo ficam em grafo._heuristicas_cache, chaveadas por
+# (tipo, idx_objetivo): o grafo invalida o dicionário quando sua topologia
+# muda (adicionar_no/conectar_nos), então nunca há tabela obsoleta nem
+# colisão entre grafos — um dicionário global chaveado por id(grafo) pode
+# sobreviver à mutação do grafo e até ser reaproveitado por outro objeto
+# quando o id é reciclado. Limite por grafo para não crescer sem controle
+_CACHE_MAX_ENTRADAS = 64
 
-def distancia_manhattan_cached(no_atual, objetivo):
+# Grafos com tabelas vivas, para limpar_cache_heuristicas; referências
+# fracas para não segurar grafos descartados na memória
+_grafos_com_cache = weakref.WeakSet()
+
+def precalcular_manhattan_objetivo(grafo, objetivo):
     """
-    Versão com cache da distância Manhattan para otimizar performance
-    
+    Precalcula a distância Manhattan de todos os nós até um objetivo fixo
+
+    A tabela é indexada pelo índice plano de cada nó (No.idx), trocando o
+    hash de tuplas de coordenadas por uma indexação direta O(1).
+
     Args:
-        no_atual (No): Nó atual
-        objetivo (No): Nó objetivo
-        
+        grafo (Graph): Grafo do ambiente
+        objetivo (No): Nó objetivo fixo da busca
+
     Returns:
-        int: Distância Manhattan (do cache se disponível)
+        list: Tabela onde tabela[no.idx] é a distância Manhattan até o objetivo
     """
-    chave = ((no_atual.x, no_atual.y), (objetivo.x, objetivo.y))
-    
-    if chave not in _cache_distancias:
-        _cache_distancias[chave] = distancia_manhattan(no_atual, objetivo)
-    
-    return _cache_distancias[chave]
+    _, indice_no, _, _, _ = grafo.construir_indice_plano()
+    cache = grafo._heuristicas_cache
+    chave = ('manhattan', indice_no[objetivo])
+
+    if chave not in cache:
+        if len(cache) >= _CACHE_MAX_ENTRADAS:
+            cache.clear()
+        _grafos_com_cache.add(grafo)
+        obj_x, obj_y = objetivo.x, objetivo.y
+        # Lê os arrays SoA do grafo em vez de atributos de cada No
+        cache[chave] = [abs(x - obj_x) + abs(y - obj_y)
+                        for x, y in zip(grafo.xs, grafo.ys)]
+
+    return cache[chave]
+
+
+def precalcular_heuristica_terreno(grafo, objetivo):
+    """
+    Precalcula a heurística de terreno de todos os nós até um objetivo fixo
+
+    Equivale a chamar heuristica_terreno(no, objetivo) para cada nó, mas a
+    tabela é construída uma única vez por (grafo, objetivo) e consultada por
+    índice plano dentro do laço do A*.
+
+    Args:
+        grafo (Graph): Grafo do ambiente
+        objetivo (No): Nó objetivo fixo da busca
+
+    Returns:
+        list: Tabela onde tabela[no.idx] é a heurística de terreno até o objetivo
+    """
+    _, indice_no, _, _, _ = grafo.construir_indice_plano()
+    cache = grafo._heuristicas_cache
+    chave = ('terreno', indice_no[objetivo])
+
+    if chave not in cache:
+        if len(cache) >= _CACHE_MAX_ENTRADAS:
+            cache.clear()
+        _grafos_com_cache.add(grafo)
+        distancias = precalcular_manhattan_objetivo(grafo, objetivo)
+        cache[chave] = [d * _CUSTO_MIN_TERRENO for d in distancias]
+
+    return cache[chave]
 
 
 def limpar_cache_heuristicas():
-    """Limpa o cache de heurísticas para economizar memória"""
-    global _cache_distancias
-    _cache_distancias.clear()
+    """Limpa as tabelas de heurística dos grafos vivos para economizar memória"""
+    for grafo in list(_grafos_com_cache):
+        grafo._heuristicas_cache.clear()
+    _grafos_com_cache.clear()
 
 
 # Teste básico do módulo
@@ -4,14 +4,14 @@ Implementa BFS, DFS, Busca Gulosa e A* com suas estratégias específicas.
 """
 
 import time
+from array import array
 from collections import deque
+from itertools import count
 import heapq
+import config
 from nucleo.graph import Graph, No, TipoTerreno
-from nucleo.agent import AgentEstado
-from .heuristics import (distancia_manhattan, heuristica_combinada,
-                        heuristica_gulosa_agressiva, heuristica_terreno,
-                        limpar_cache_heuristicas)
-from algoritmos.search_algorithms import *
+from .heuristics import (precalcular_heuristica_gulosa,
+                        precalcular_heuristica_terreno)
 
 class ResultadoBusca:
     """Armazena o resultado de uma execução de algoritmo de busca"""
@@ -53,40 +53,48 @@ def busca_bfs(grafo, no_inicial, no_objetivo, limite_nos=10000):
         ResultadoBusca: Resultado da busca
     """
     resultado = ResultadoBusca("BFS")
-    inicio_tempo = time.time()
+    inicio_tempo = time.perf_counter()
     
     if no_inicial == no_objetivo:
         resultado.definir_resultado([no_inicial], 0, 0, 0.0)
         return resultado
     
+    # Trabalha sobre a representação plana do grafo: o laço quente manipula
+    # apenas inteiros, sem criar AgentEstado por nó enfileirado
+    nos_ordenados, indice_no, viz_inicio, viz_idx, _ = grafo.construir_indice_plano()
+    idx_inicial = indice_no[no_inicial]
+    idx_objetivo = indice_no[no_objetivo]
+
     # Fila FIFO para BFS
-    fila = deque([AgentEstado(no_inicial, 0, 0, None)])
-    visitados = {no_inicial}
+    fila = deque([idx_inicial])
+    visitado = bytearray(len(nos_ordenados))
+    visitado[idx_inicial] = 1
+    pai = array('i', [-1]) * len(nos_ordenados)
     nos_expandidos = 0
-    
+
     while fila and nos_expandidos < limite_nos:
-        estado_atual = fila.popleft()
+        idx_atual = fila.popleft()
         nos_expandidos += 1
-        
+
         # Verifica se chegou ao objetivo
-        if estado_atual.no == no_objetivo:
-            caminho = estado_atual.reconstruir_caminho()
+        if idx_atual == idx_objetivo:
+            caminho = _reconstruir_caminho_indices(idx_atual, pai, nos_ordenados)
             custo_total = calcular_custo_caminho(caminho, grafo)
-            tempo_total = time.time() - inicio_tempo
-            
+            tempo_total = time.perf_counter() - inicio_tempo
+
             resultado.definir_resultado(caminho, custo_total, nos_expandidos, tempo_total)
             return resultado
-        
+
         # Expande vizinhos
-        for vizinho, custo_aresta in grafo.adjacencias[estado_atual.no]:
-            if vizinho not in visitados:
-                visitados.add(vizinho)
-                novo_custo = estado_atual.custo_g + custo_aresta
-                novo_estado = AgentEstado(vizinho, novo_custo, 0, estado_atual)
-                fila.append(novo_estado)
+        for e in range(viz_inicio[idx_atual], viz_inicio[idx_atual + 1]):
+            idx_vizinho = viz_idx[e]
+            if not visitado[idx_vizinho]:
+                visitado[idx_vizinho] = 1
+                pai[idx_vizinho] = idx_atual
+                fila.append(idx_vizinho)
     
     # Não encontrou caminho
-    tempo_total = time.time() - inicio_tempo
+    tempo_total = time.perf_counter() - inicio_tempo
     resultado.definir_resultado([], 0, nos_expandidos, tempo_total, False)
     return resultado
 
@@ -106,41 +114,48 @@ def busca_dfs(grafo, no_inicial, no_objetivo, limite_nos=10000):
         ResultadoBusca: Resultado da busca
     """
     resultado = ResultadoBusca("DFS")
-    inicio_tempo = time.time()
+    inicio_tempo = time.perf_counter()
     
     if no_inicial == no_objetivo:
         resultado.definir_resultado([no_inicial], 0, 0, 0.0)
         return resultado
     
+    # Trabalha sobre a representação plana do grafo, como no BFS: a pilha
+    # guarda apenas índices inteiros e o caminho é reconstruído pelos pais
+    nos_ordenados, indice_no, viz_inicio, viz_idx, _ = grafo.construir_indice_plano()
+    idx_inicial = indice_no[no_inicial]
+    idx_objetivo = indice_no[no_objetivo]
+
     # Pilha LIFO para DFS
-    pilha = [AgentEstado(no_inicial, 0, 0, None)]
-    visitados = {no_inicial}
+    pilha = [idx_inicial]
+    visitado = bytearray(len(nos_ordenados))
+    visitado[idx_inicial] = 1
+    pai = array('i', [-1]) * len(nos_ordenados)
     nos_expandidos = 0
-    
+
     while pilha and nos_expandidos < limite_nos:
-        estado_atual = pilha.pop()
+        idx_atual = pilha.pop()
         nos_expandidos += 1
-        
+
         # Verifica se chegou ao objetivo
-        if estado_atual.no == no_objetivo:
-            caminho = estado_atual.reconstruir_caminho()
+        if idx_atual == idx_objetivo:
+            caminho = _reconstruir_caminho_indices(idx_atual, pai, nos_ordenados)
             custo_total = calcular_custo_caminho(caminho, grafo)
-            tempo_total = time.time() - inicio_tempo
-            
+            tempo_total = time.perf_counter() - inicio_tempo
+
             resultado.definir_resultado(caminho, custo_total, nos_expandidos, tempo_total)
             return resultado
-        
+
         # Expande vizinhos (em ordem reversa para manter comportamento consistente)
-        vizinhos = list(grafo.adjacencias[estado_atual.no])
-        for vizinho, custo_aresta in reversed(vizinhos):
-            if vizinho not in visitados:
-                visitados.add(vizinho)
-                novo_custo = estado_atual.custo_g + custo_aresta
-                novo_estado = AgentEstado(vizinho, novo_custo, 0, estado_atual)
-                pilha.append(novo_estado)
+        for e in range(viz_inicio[idx_atual + 1] - 1, viz_inicio[idx_atual] - 1, -1):
+            idx_vizinho = viz_idx[e]
+            if not visitado[idx_vizinho]:
+                visitado[idx_vizinho] = 1
+                pai[idx_vizinho] = idx_atual
+                pilha.append(idx_vizinho)
     
     # Não encontrou caminho
-    tempo_total = time.time() - inicio_tempo
+    tempo_total = time.perf_counter() - inicio_tempo
     resultado.definir_resultado([], 0, nos_expandidos, tempo_total, False)
     return resultado
 
@@ -160,115 +175,280 @@ def busca_gulosa(grafo, no_inicial, no_objetivo, limite_nos=10000):
         ResultadoBusca: Resultado da busca
     """
     resultado = ResultadoBusca("Gulosa")
-    inicio_tempo = time.time()
+    inicio_tempo = time.perf_counter()
     
     if no_inicial == no_objetivo:
         resultado.definir_resultado([no_inicial], 0, 0, 0.0)
         return resultado
     
     # Fila de prioridade ordenada por heurística h(n)
+    # A tabela precalculada troca a varredura de recompensas por nó expandido
+    # por uma única BFS multi-origem no início da busca
+    nos_ordenados, indice_no, viz_inicio, viz_idx, _ = grafo.construir_indice_plano()
+    idx_inicial = indice_no[no_inicial]
+    idx_objetivo = indice_no[no_objetivo]
+
     recompensas = grafo.obter_nos_com_recompensa()
-    h_inicial = heuristica_gulosa_agressiva(no_inicial, no_objetivo, grafo, recompensas)
-    
-    fila_prioridade = [AgentEstado(no_inicial, 0, h_inicial, None)]
-    visitados = {no_inicial}
+    h_gulosa = precalcular_heuristica_gulosa(grafo, no_objetivo, recompensas)
+    contador = count()  # Desempate por ordem de inserção (evita comparar nós)
+
+    fila_prioridade = [(h_gulosa[idx_inicial], next(contador), idx_inicial)]
+    visitado = bytearray(len(nos_ordenados))
+    visitado[idx_inicial] = 1
+    pai = [-1] * len(nos_ordenados)
     nos_expandidos = 0
-    
+
     while fila_prioridade and nos_expandidos < limite_nos:
-        estado_atual = heapq.heappop(fila_prioridade)
+        _, _, idx_atual = heapq.heappop(fila_prioridade)
         nos_expandidos += 1
-        
+
         # Verifica se chegou ao objetivo
-        if estado_atual.no == no_objetivo:
-            caminho = estado_atual.reconstruir_caminho()
+        if idx_atual == idx_objetivo:
+            caminho = _reconstruir_caminho_indices(idx_atual, pai, nos_ordenados)
             custo_total = calcular_custo_caminho(caminho, grafo)
-            tempo_total = time.time() - inicio_tempo
-            
+            tempo_total = time.perf_counter() - inicio_tempo
+
             resultado.definir_resultado(caminho, custo_total, nos_expandidos, tempo_total)
             return resultado
-        
+
         # Expande vizinhos
-        for vizinho, custo_aresta in grafo.adjacencias[estado_atual.no]:
-            if vizinho not in visitados:
-                visitados.add(vizinho)
-                h_vizinho = heuristica_gulosa_agressiva(vizinho, no_objetivo, grafo, recompensas)
-                novo_custo = estado_atual.custo_g + custo_aresta
-                novo_estado = AgentEstado(vizinho, novo_custo, h_vizinho, estado_atual)
-                heapq.heappush(fila_prioridade, novo_estado)
+        for e in range(viz_inicio[idx_atual], viz_inicio[idx_atual + 1]):
+            idx_vizinho = viz_idx[e]
+            if not visitado[idx_vizinho]:
+                visitado[idx_vizinho] = 1
+                pai[idx_vizinho] = idx_atual
+                heapq.heappush(fila_prioridade,
+                               (h_gulosa[idx_vizinho], next(contador), idx_vizinho))
     
     # Não encontrou caminho
-    tempo_total = time.time() - inicio_tempo
+    tempo_total = time.perf_counter() - inicio_tempo
     resultado.definir_resultado([], 0, nos_expandidos, tempo_total, False)
     return resultado
 
 
-def busca_a_estrela(grafo, no_inicial, no_objetivo, limite_nos=10000):
+def busca_a_estrela(grafo, no_inicial, no_objetivo, limite_nos=10000,
+                    peso_h=config.PESO_HEURISTICA_ASTAR):
     """
     Busca A* (A-Star)
-    Usa função f(n) = g(n) + h(n) para encontrar caminho ótimo
-    
+    Usa função f(n) = g(n) + peso_h * h(n) para encontrar caminho ótimo
+
     Args:
         grafo (Graph): Grafo do ambiente
         no_inicial (No): Nó inicial
         no_objetivo (No): Nó objetivo
         limite_nos (int): Limite de nós para evitar loops infinitos
-        
+        peso_h (float): Peso da heurística (1.0 = A* clássico/ótimo;
+            valores maiores expandem menos nós, com sub-otimalidade
+            limitada por peso_h - Weighted A*)
+
     Returns:
         ResultadoBusca: Resultado da busca
     """
     resultado = ResultadoBusca("A*")
-    inicio_tempo = time.time()
+    inicio_tempo = time.perf_counter()
     
     if no_inicial == no_objetivo:
         resultado.definir_resultado([no_inicial], 0, 0, 0.0)
         return resultado
     
+    # Trabalha sobre a representação plana do grafo (índices inteiros),
+    # evitando alocar AgentEstado e comparar objetos dentro do heap
+    nos_ordenados, indice_no, viz_inicio, viz_idx, viz_custo = grafo.construir_indice_plano()
+    total_nos = len(nos_ordenados)
+    idx_inicial = indice_no[no_inicial]
+    idx_objetivo = indice_no[no_objetivo]
+
+    # Vetores planos tipados: custo g conhecido e pai por índice de nó
+    g_score = array('d', [float('inf')]) * total_nos
+    g_score[idx_inicial] = 0
+    pai = array('i', [-1]) * total_nos
+    fechado = bytearray(total_nos)  # Nós já expandidos (conjunto fechado)
+
     # Fila de prioridade ordenada por f(n) = g(n) + h(n)
-    # A* usa heurística de terreno (admissível) sem considerar recompensas
-    h_inicial = heuristica_terreno(no_inicial, no_objetivo, grafo)
-    f_inicial = 0 + h_inicial
-    
-    fila_prioridade = [AgentEstado(no_inicial, 0, f_inicial, None)]
-    visitados = {}  # Dicionário para armazenar melhor custo g conhecido
-    visitados[no_inicial] = 0
+    # A* usa heurística de terreno (admissível) sem considerar recompensas;
+    # a tabela por objetivo troca a chamada de função por indexação direta
+    h_objetivo = precalcular_heuristica_terreno(grafo, no_objetivo)
+    contador = count()  # Desempate final por ordem de inserção (evita comparar nós)
+
+    # Empates em f são desfeitos pelo menor h: entre caminhos de mesmo custo
+    # estimado, expande primeiro o nó mais próximo do objetivo
+    h_inicial = h_objetivo[idx_inicial]
+    fila_prioridade = [(peso_h * h_inicial, h_inicial, next(contador), idx_inicial, 0)]
     nos_expandidos = 0
-    
+
     while fila_prioridade and nos_expandidos < limite_nos:
-        estado_atual = heapq.heappop(fila_prioridade)
-        
-        # Se encontramos um caminho pior para este nó, ignora sem contar a expansão
-        if estado_atual.custo_g > visitados.get(estado_atual.no, float('inf')):
+        _, _, _, idx_atual, custo_g = heapq.heappop(fila_prioridade)
+
+        # Entradas reinseridas de um nó já expandido são descartadas em O(1)
+        # sem contar a expansão (a primeira retirada já tinha o melhor g)
+        if fechado[idx_atual]:
             continue
-        
+        fechado[idx_atual] = 1
+
         nos_expandidos += 1
-        
+
         # Verifica se chegou ao objetivo
-        if estado_atual.no == no_objetivo:
-            caminho = estado_atual.reconstruir_caminho()
-            custo_total = estado_atual.custo_g
-            tempo_total = time.time() - inicio_tempo
-            
-            resultado.definir_resultado(caminho, custo_total, nos_expandidos, tempo_total)
+        if idx_atual == idx_objetivo:
+            caminho = _reconstruir_caminho_indices(idx_atual, pai, nos_ordenados)
+            tempo_total = time.perf_counter() - inicio_tempo
+
+            resultado.definir_resultado(caminho, custo_g, nos_expandidos, tempo_total)
             return resultado
-        
-        # Expande vizinhos
-        for vizinho, custo_aresta in grafo.adjacencias[estado_atual.no]:
-            novo_custo_g = estado_atual.custo_g + custo_aresta
-            
+
+        # Expande vizinhos (indexação inteira sobre os arrays CSR)
+        for e in range(viz_inicio[idx_atual], viz_inicio[idx_atual + 1]):
+            idx_vizinho = viz_idx[e]
+            if fechado[idx_vizinho]:
+                continue
+            novo_custo_g = custo_g + viz_custo[e]
+
             # Se encontramos um caminho melhor para o vizinho
-            if novo_custo_g < visitados.get(vizinho, float('inf')):
-                visitados[vizinho] = novo_custo_g
-                h_vizinho = heuristica_terreno(vizinho, no_objetivo, grafo)
-                f_vizinho = novo_custo_g + h_vizinho
-                novo_estado = AgentEstado(vizinho, novo_custo_g, f_vizinho, estado_atual)
-                heapq.heappush(fila_prioridade, novo_estado)
-    
+            if novo_custo_g < g_score[idx_vizinho]:
+                g_score[idx_vizinho] = novo_custo_g
+                pai[idx_vizinho] = idx_atual
+                h_vizinho = h_objetivo[idx_vizinho]
+                f_vizinho = novo_custo_g + peso_h * h_vizinho
+                heapq.heappush(fila_prioridade,
+                               (f_vizinho, h_vizinho, next(contador),
+                                idx_vizinho, novo_custo_g))
+
     # Não encontrou caminho
-    tempo_total = time.time() - inicio_tempo
+    tempo_total = time.perf_counter() - inicio_tempo
     resultado.definir_resultado([], 0, nos_expandidos, tempo_total, False)
     return resultado
 
 
+def busca_a_estrela_bidirecional(grafo, no_inicial, no_objetivo, limite_nos=10000):
+    """
+    Busca A* Bidirecional
+    Expande duas frentes simultâneas (início -> objetivo e objetivo -> início)
+    e costura o caminho quando as frentes se encontram, expandindo tipicamente
+    cerca de metade dos nós de um A* unidirecional
+
+    Args:
+        grafo (Graph): Grafo do ambiente
+        no_inicial (No): Nó inicial
+        no_objetivo (No): Nó objetivo
+        limite_nos (int): Limite de nós para evitar loops infinitos
+
+    Returns:
+        ResultadoBusca: Resultado da busca
+    """
+    resultado = ResultadoBusca("A* Bidirecional")
+    inicio_tempo = time.perf_counter()
+
+    if no_inicial == no_objetivo:
+        resultado.definir_resultado([no_inicial], 0, 0, 0.0)
+        return resultado
+
+    nos_ordenados, indice_no, viz_inicio, viz_idx, viz_custo = grafo.construir_indice_plano()
+    total_nos = len(nos_ordenados)
+    custos_no = grafo.custos_no
+    idx_inicial = indice_no[no_inicial]
+    idx_objetivo = indice_no[no_objetivo]
+
+    # Heurísticas admissíveis de cada frente: distância até o alvo da frente
+    h_frente = precalcular_heuristica_terreno(grafo, no_objetivo)
+    h_tras = precalcular_heuristica_terreno(grafo, no_inicial)
+
+    infinito = float('inf')
+    g_frente = array('d', [infinito]) * total_nos
+    g_tras = array('d', [infinito]) * total_nos
+    g_frente[idx_inicial] = 0
+    g_tras[idx_objetivo] = 0
+    pai_frente = array('i', [-1]) * total_nos
+    pai_tras = array('i', [-1]) * total_nos
+    fechado_frente = bytearray(total_nos)
+    fechado_tras = bytearray(total_nos)
+
+    contador = count()
+    fila_frente = [(h_frente[idx_inicial], next(contador), idx_inicial, 0.0)]
+    fila_tras = [(h_tras[idx_objetivo], next(contador), idx_objetivo, 0.0)]
+
+    melhor_custo = infinito  # Melhor custo completo conhecido (ponto de encontro)
+    idx_encontro = -1
+    nos_expandidos = 0
+
+    while fila_frente and fila_tras and nos_expandidos < limite_nos:
+        # Critério de parada: nenhuma das frentes pode mais melhorar o encontro
+        if melhor_custo <= max(fila_frente[0][0], fila_tras[0][0]):
+            break
+
+        # Expande a frente com a fila menor, equilibrando as duas buscas
+        frente = len(fila_frente) <= len(fila_tras)
+        if frente:
+            fila, g_aqui, g_outro = fila_frente, g_frente, g_tras
+            pai_aqui, fechado_aqui = pai_frente, fechado_frente
+            h_aqui = h_frente
+        else:
+            fila, g_aqui, g_outro = fila_tras, g_tras, g_frente
+            pai_aqui, fechado_aqui = pai_tras, fechado_tras
+            h_aqui = h_tras
+
+        _, _, idx_atual, custo_g = heapq.heappop(fila)
+        if fechado_aqui[idx_atual]:
+            continue
+        fechado_aqui[idx_atual] = 1
+        nos_expandidos += 1
+
+        for e in range(viz_inicio[idx_atual], viz_inicio[idx_atual + 1]):
+            idx_vizinho = viz_idx[e]
+            if fechado_aqui[idx_vizinho]:
+                continue
+            # Na frente reversa o custo da aresta é o do terreno do nó de
+            # origem, pois percorremos a aresta no sentido contrário
+            custo_aresta = viz_custo[e] if frente else custos_no[idx_atual]
+            novo_custo_g = custo_g + custo_aresta
+
+            if novo_custo_g < g_aqui[idx_vizinho]:
+                g_aqui[idx_vizinho] = novo_custo_g
+                pai_aqui[idx_vizinho] = idx_atual
+                heapq.heappush(fila, (novo_custo_g + h_aqui[idx_vizinho],
+                                      next(contador), idx_vizinho, novo_custo_g))
+
+                # As frentes se tocaram: registra o melhor ponto de encontro
+                custo_completo = novo_custo_g + g_outro[idx_vizinho]
+                if custo_completo < melhor_custo:
+                    melhor_custo = custo_completo
+                    idx_encontro = idx_vizinho
+
+    if idx_encontro == -1:
+        tempo_total = time.perf_counter() - inicio_tempo
+        resultado.definir_resultado([], 0, nos_expandidos, tempo_total, False)
+        return resultado
+
+    # Costura o caminho: início -> encontro (frente) + encontro -> objetivo (trás)
+    caminho = _reconstruir_caminho_indices(idx_encontro, pai_frente, nos_ordenados)
+    idx = pai_tras[idx_encontro]
+    while idx != -1:
+        caminho.append(nos_ordenados[idx])
+        idx = pai_tras[idx]
+
+    tempo_total = time.perf_counter() - inicio_tempo
+    resultado.definir_resultado(caminho, melhor_custo, nos_expandidos, tempo_total)
+    return resultado
+
+
+def _reconstruir_caminho_indices(idx_final, pai, nos_ordenados):
+    """
+    Reconstrói o caminho a partir do vetor de pais indexado por nó
+
+    Args:
+        idx_final (int): Índice do nó final
+        pai (list): Vetor onde pai[i] é o índice do nó anterior (-1 na origem)
+        nos_ordenados (list): Lista de nós indexada pelos mesmos índices
+
+    Returns:
+        list: Lista de nós do caminho, da origem ao destino
+    """
+    caminho = []
+    idx = idx_final
+    while idx != -1:
+        caminho.append(nos_ordenados[idx])
+        idx = pai[idx]
+    return list(reversed(caminho))
+
+
 def calcular_custo_caminho(caminho, grafo):
     """
     Calcula o custo total de um caminho
@@ -282,15 +462,14 @@ def calcular_custo_caminho(caminho, grafo):
     """
     if len(caminho) <= 1:
         return 0
-    
+
+    # O custo de cada aresta é o custo do terreno de destino (ver
+    # Graph.conectar_nos), então basta somar o terreno dos nós visitados
+    # sem varrer as listas de adjacência
     custo_total = 0
-    for i in range(len(caminho) - 1):
-        no_atual = caminho[i]
-        no_proximo = caminho[i + 1]
-        
-        # Encontra o custo da aresta
-        custo_total += grafo.obter_custo_aresta(no_atual, no_proximo)
-                
+    for no_proximo in caminho[1:]:
+        custo_total += no_proximo.custo
+
     return custo_total
 
 
@@ -325,10 +504,15 @@ def executar_todos_algoritmos(grafo, no_inicial, no_objetivo):
         dict: Dicionário com resultados de todos os algoritmos
     """
     print("Executando algoritmos de busca...")
-    
-    # Limpa cache de heurísticas para medição precisa
-    limpar_cache_heuristicas()
-    
+
+    # Constrói o índice plano e a tabela de heurística do objetivo uma única
+    # vez: as quatro buscas compartilham o mesmo precompute via cache por
+    # (grafo, objetivo), em vez de cada uma pagar a construção de novo.
+    # Manter o cache quente entre execuções é seguro porque as tabelas
+    # vivem no próprio grafo e são invalidadas quando a topologia muda
+    grafo.construir_indice_plano()
+    precalcular_heuristica_terreno(grafo, no_objetivo)
+
     resultados = {}
     
     # Lista de algoritmos para executar
@@ -34,6 +34,11 @@ BIOMA_DISTRIBUICAO = [
     (0.8, 1.0, 'PANTANO')   # 20% - Pântano
 ]
 
+# Configurações dos Algoritmos de Busca
+# Peso da heurística no A* (Weighted A*). 1.0 = A* clássico (ótimo);
+# valores > 1.0 (ex: 1.25) expandem menos nós, com custo até peso_h vezes o ótimo
+PESO_HEURISTICA_ASTAR = 1.0
+
 # Configurações de Simulação
 SIMULACAO_VELOCIDADE_PADRAO = 1.0  # Segundos por passo na visualização
 
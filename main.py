@@ -7,9 +7,6 @@ import sys
 import os
 import config
 
-# Adiciona o diretório atual ao path para importações
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from nucleo.graph import gerar_grafo_labirinto_com_biomas
 from nucleo.agent import Agent
 from algoritmos.search_algorithms import executar_todos_algoritmos
@@ -17,9 +14,9 @@ from utilitarios.visualization import renderizar_mapa_com_legenda, obter_estatis
 from utilitarios.results import ResultadoComparativo
 
 
-def exibir_banner():
-    """Exibe banner inicial do sistema"""
-    banner = """
+# Textos fixos pré-montados uma única vez: cada exibição vira uma
+# única escrita em stdout em vez de vários prints
+BANNER_TEXTO = """
 ╔══════════════════════════════════════════════════════════════╗
 ║                SISTEMA DE ALGORITMOS DE BUSCA                ║
 ║                      Trabalho Acadêmico                      ║
@@ -29,7 +26,24 @@ def exibir_banner():
 ║  Com suporte a terrenos variados e coleta de recompensas     ║
 ╚══════════════════════════════════════════════════════════════╝
 """
-    print(banner)
+
+MENU_TEXTO = "\n" + "\n".join([
+    "=" * 50,
+    "           MENU PRINCIPAL",
+    "=" * 50,
+    "1. Executar simulacao completa",
+    "2. Ver mapa do ambiente atual",
+    "3. Simular movimento de algoritmo",
+    "4. Gerar novo ambiente",
+    "5. Salvar relatorio",
+    "6. Sair",
+    "=" * 50,
+]) + "\n"
+
+
+def exibir_banner():
+    """Exibe banner inicial do sistema"""
+    print(BANNER_TEXTO)
 
 
 def inicializar_ambiente():
@@ -103,17 +117,8 @@ def menu_principal():
     Exibe menu principal e gerencia interações
     """
     while True:
-        print("\n" + "="*50)
-        print("           MENU PRINCIPAL")
-        print("="*50)
-        print("1. Executar simulacao completa")
-        print("2. Ver mapa do ambiente atual")
-        print("3. Simular movimento de algoritmo")
-        print("4. Gerar novo ambiente")
-        print("5. Salvar relatorio")
-        print("6. Sair")
-        print("="*50)
-        
+        sys.stdout.write(MENU_TEXTO)
+
         try:
             opcao = input("Escolha uma opção (1-6): ").strip()
             
@@ -180,11 +185,24 @@ def main():
     agente = None
     ultimo_comparativo = None
     ultimos_resultados = None
-    
+
+    # Render do mapa memoizado: invalidado quando grafo/agente mudam,
+    # evitando redesenhar o mapa inteiro em salvamentos consecutivos
+    mapa_render_cache = None
+
     try:
         # Banner inicial
         exibir_banner()
-        
+
+        # Valores de configuração usados no loop interativo, lidos uma vez
+        # como locais para evitar a busca de atributo a cada iteração
+        dir_resultados = config.DIR_RESULTADOS
+        velocidade_padrao = config.SIMULACAO_VELOCIDADE_PADRAO
+        nome_relatorio_padrao = config.ARQUIVO_RELATORIO_PADRAO
+
+        # Garante a pasta de resultados uma única vez, e não a cada salvamento
+        os.makedirs(dir_resultados, exist_ok=True)
+
         # Inicializa ambiente inicial
         grafo, no_inicial, no_objetivo, agente = inicializar_ambiente()
         if not grafo:
@@ -211,6 +229,7 @@ def main():
                     # Salva para uso posterior
                     ultimo_comparativo = comparativo
                     ultimos_resultados = resultados
+                    mapa_render_cache = None
                     
                     print("\n[INFO] Simulacao concluida! Retornando ao menu principal...")
                 else:
@@ -221,7 +240,9 @@ def main():
                     limpar_console()
                     print("MAPA DO AMBIENTE ATUAL")
                     print("="*50)
-                    print(renderizar_mapa_com_legenda(grafo, agente))
+                    if mapa_render_cache is None:
+                        mapa_render_cache = renderizar_mapa_com_legenda(grafo, agente)
+                    print(mapa_render_cache)
                     print("\n[INFO] Retornando ao menu principal...")
                 else:
                     print("[X] Nenhum ambiente carregado!")
@@ -237,12 +258,13 @@ def main():
                             grafo.resetar_recompensas()
                             
                             try:
-                                entrada = input(f"Velocidade (segundos por passo, padrão {config.SIMULACAO_VELOCIDADE_PADRAO}): ")
-                                velocidade = float(entrada) if entrada else config.SIMULACAO_VELOCIDADE_PADRAO
+                                entrada = input(f"Velocidade (segundos por passo, padrão {velocidade_padrao}): ")
+                                velocidade = float(entrada) if entrada else velocidade_padrao
                             except:
-                                velocidade = config.SIMULACAO_VELOCIDADE_PADRAO
+                                velocidade = velocidade_padrao
                             
                             simular_movimento(grafo, agente, resultado.caminho_encontrado, velocidade)
+                            mapa_render_cache = None
                             print("\n[INFO] Simulacao de movimento concluida! Retornando ao menu principal...")
                         else:
                             print(f"[X] {algoritmo} nao encontrou solucao!")
@@ -256,12 +278,13 @@ def main():
                 grafo, no_inicial, no_objetivo, agente = inicializar_ambiente()
                 ultimo_comparativo = None
                 ultimos_resultados = None
+                mapa_render_cache = None
                 if grafo:
                     print("[OK] Novo ambiente criado com sucesso!")
                     
             elif opcao == "salvar_relatorio":
                 if ultimo_comparativo:
-                    nome_padrao = config.ARQUIVO_RELATORIO_PADRAO
+                    nome_padrao = nome_relatorio_padrao
                     nome_arquivo = input(f"Nome do arquivo (padrão: {nome_padrao}): ").strip()
                     if not nome_arquivo:
                         nome_arquivo = nome_padrao
@@ -273,27 +296,25 @@ def main():
                         nome_arquivo += ".txt"
                     
                     # Garante que será salvo na pasta resultados
-                    dir_resultados = config.DIR_RESULTADOS
                     relatorio_path = os.path.join(dir_resultados, nome_arquivo)
                     mapa_path = os.path.join(dir_resultados, f"mapa_{nome_arquivo.replace('.txt', '')}.txt")
-                    
-                    # Cria pasta resultados se não existir
-                    os.makedirs(dir_resultados, exist_ok=True)
-                    
+
                     if ultimo_comparativo.salvar_relatorio(relatorio_path):
                         print(f"[OK] Relatorio salvo em: {relatorio_path}")
                         
                         # Salva mapa separadamente se disponível
                         if grafo:
                             try:
+                                if mapa_render_cache is None:
+                                    mapa_render_cache = renderizar_mapa_com_legenda(grafo, agente)
                                 mapa_conteudo = f"""MAPA DO AMBIENTE ATUAL - SISTEMA DE ALGORITMOS DE BUSCA
 ============================================================
 Ambiente: {grafo.largura}x{grafo.altura} ({len(grafo.nos)} nós)
 Início: ({no_inicial.x}, {no_inicial.y}) -> Objetivo: ({no_objetivo.x}, {no_objetivo.y})
-Recompensas disponíveis: {len([n for n in grafo.nos.values() if n.tem_recompensa])}
+Recompensas disponíveis: {grafo.contar_recompensas()}
 Gerado em: {ultimo_comparativo.timestamp}
 
-{renderizar_mapa_com_legenda(grafo, agente)}
+{mapa_render_cache}
 ============================================================
 """
                                 with open(mapa_path, 'w', encoding='utf-8') as f:
@@ -334,14 +355,12 @@ def executar_demo_rapida():
     print(comparativo.gerar_analise_detalhada())
     print(comparativo.gerar_recomendacoes())
     
-    # Salva relatório automaticamente na pasta resultados
+    # Salva relatório automaticamente na pasta resultados (criada uma vez)
     dir_resultados = config.DIR_RESULTADOS
+    os.makedirs(dir_resultados, exist_ok=True)
     relatorio_path = os.path.join(dir_resultados, config.ARQUIVO_DEMO_RELATORIO)
     mapa_path = os.path.join(dir_resultados, config.ARQUIVO_DEMO_MAPA)
-    
-    # Cria pasta resultados se não existir
-    os.makedirs(dir_resultados, exist_ok=True)
-    
+
     # Salva relatório completo
     comparativo.salvar_relatorio(relatorio_path)
     
@@ -350,7 +369,7 @@ def executar_demo_rapida():
 ============================================================
 Ambiente: {grafo.largura}x{grafo.altura} ({len(grafo.nos)} nós)
 Início: ({no_inicial.x}, {no_inicial.y}) -> Objetivo: ({no_objetivo.x}, {no_objetivo.y})
-Recompensas disponíveis: {len([n for n in grafo.nos.values() if n.tem_recompensa])}
+Recompensas disponíveis: {grafo.contar_recompensas()}
 Gerado em: {comparativo.timestamp}
 
 {renderizar_mapa_com_legenda(grafo, agente)}
@@ -3,12 +3,22 @@ Módulo responsável pela representação e lógica do agente inteligente.
 Gerencia posição, objetivo, coleta de recompensas e histórico de movimento.
 """
 
+from array import array
+from collections import deque
+
 from .graph import Graph, No, TipoTerreno
 
 
 class Agent:
-    
-    def __init__(self, posicao_inicial, objetivo):
+
+    # Sem __dict__ por instância: menos memória e acesso a atributo mais direto
+    __slots__ = ('posicao_inicial', 'posicao_atual', 'objetivo',
+                 'recompensas_coletadas', 'caminho_percorrido',
+                 'custo_acumulado', '_caminho_xs', '_caminho_ys',
+                 '_coletadas_pos', 'reverso', 'posicao_atual_reverso',
+                 'caminho_reverso')
+
+    def __init__(self, posicao_inicial, objetivo, reverso=False):
         """
         Inicializa o agente
 {{ ... }}
@@ -16,6 +26,8 @@ class Agent:
         Args:
             posicao_inicial (No): Nó de posição inicial
             objetivo (No): Nó objetivo/destino
+            reverso (bool): Se True, mantém também uma frente reversa
+                partindo do objetivo (para buscas bidirecionais)
         """
         self.posicao_inicial = posicao_inicial
         self.posicao_atual = posicao_inicial
@@ -23,21 +35,46 @@ class Agent:
         self.recompensas_coletadas = []
         self.caminho_percorrido = [posicao_inicial]
         self.custo_acumulado = 0
-        
+
+        # Conjunto de posições coletadas: teste de pertinência em O(1)
+        # sem varrer a lista de recompensas
+        self._coletadas_pos = set()
+
+        # Frente reversa opcional: espelha os campos de avanço partindo
+        # do objetivo, permitindo que a camada de busca expanda as duas
+        # pontas e encerre na interseção
+        self.reverso = reverso
+        self.posicao_atual_reverso = objetivo if reverso else None
+        self.caminho_reverso = [objetivo] if reverso else None
+
+        # Buffers tipados paralelos com as coordenadas do caminho: mantêm
+        # os dados contíguos para consultas de coordenadas sem percorrer
+        # os objetos No novamente
+        self._caminho_xs = array('i', [posicao_inicial.x])
+        self._caminho_ys = array('i', [posicao_inicial.y])
+
     def mover_para(self, no, custo_movimento):
         """
         Move o agente para um novo nó
-        
+
         Args:
             no (No): Nó de destino
             custo_movimento (int): Custo do movimento
         """
         self.posicao_atual = no
         self.caminho_percorrido.append(no)
+        self._caminho_xs.append(no.x)
+        self._caminho_ys.append(no.y)
         self.custo_acumulado += custo_movimento
-        
-        # Verifica se há recompensa no nó atual
-        self.coletar_recompensa(no)
+
+        # Verifica se há recompensa no nó atual (ramo de coletar_recompensa
+        # embutido para evitar uma chamada de método por passo)
+        if no.tem_recompensa and not no.recompensa_coletada:
+            pos = (no.x, no.y)
+            if pos not in self._coletadas_pos:
+                no.recompensa_coletada = True
+                self.recompensas_coletadas.append(no)
+                self._coletadas_pos.add(pos)
         
     def coletar_recompensa(self, no):
         """
@@ -49,11 +86,53 @@ class Agent:
         Returns:
             bool: True se coletou recompensa, False caso contrário
         """
+        pos = (no.x, no.y)
+        if pos in self._coletadas_pos:
+            return False
         if no.tem_recompensa and not no.recompensa_coletada:
             no.recompensa_coletada = True
             self.recompensas_coletadas.append(no)
+            self._coletadas_pos.add(pos)
             return True
         return False
+
+    def mover_para_reverso(self, no):
+        """
+        Avança a frente reversa para um novo nó
+
+        Args:
+            no (No): Nó de destino da frente reversa
+        """
+        if not self.reverso:
+            return
+        self.posicao_atual_reverso = no
+        self.caminho_reverso.append(no)
+
+    def obter_caminho_reverso(self):
+        """Retorna uma cópia do caminho da frente reversa (ou None)"""
+        if self.caminho_reverso is None:
+            return None
+        return self.caminho_reverso[:]
+
+    def obter_interseccao(self, outro):
+        """
+        Encontra o primeiro nó comum entre os caminhos de dois agentes
+
+        Args:
+            outro (Agent): Outro agente (tipicamente a frente oposta)
+
+        Returns:
+            No: Primeiro nó presente em ambos os caminhos, ou None
+        """
+        nos_outro = set(outro.caminho_percorrido)
+        for no in self.caminho_percorrido:
+            if no in nos_outro:
+                return no
+        return None
+
+    def ja_coletou(self, no):
+        """Verifica em O(1) se o agente já coletou a recompensa deste nó"""
+        return (no.x, no.y) in self._coletadas_pos
         
     def calcular_custo_total(self):
         """Calcula o custo total do caminho percorrido"""
@@ -64,8 +143,13 @@ class Agent:
         return self.posicao_atual == self.objetivo
         
     def obter_caminho(self):
-        """Retorna o caminho completo percorrido"""
-        return self.caminho_percorrido.copy()
+        """Retorna uma cópia do caminho completo percorrido"""
+        # Fatia implementada em C: cópia um pouco mais barata que .copy()
+        return self.caminho_percorrido[:]
+
+    def iter_caminho(self):
+        """Itera o caminho percorrido sem copiar a lista"""
+        return iter(self.caminho_percorrido)
         
     def obter_recompensas_coletadas(self):
         """Retorna lista de recompensas coletadas"""
@@ -74,12 +158,23 @@ class Agent:
     def resetar_estado(self):
         """Reseta o agente para o estado inicial"""
         self.posicao_atual = self.posicao_inicial
-        self.caminho_percorrido = [self.posicao_inicial]
+
+        # Trunca os buffers existentes em vez de realocar: preserva a
+        # capacidade já crescida para as próximas simulações
+        del self.caminho_percorrido[1:]
+        self.caminho_percorrido[0] = self.posicao_inicial
+        del self._caminho_xs[1:]
+        del self._caminho_ys[1:]
         self.custo_acumulado = 0
-        
+
         # Limpa recompensas coletadas mas não reseta o estado no grafo
         # (isso é responsabilidade do grafo)
-        self.recompensas_coletadas = []
+        self.recompensas_coletadas.clear()
+        self._coletadas_pos.clear()
+
+        if self.reverso:
+            self.posicao_atual_reverso = self.objetivo
+            del self.caminho_reverso[1:]
         
     def obter_estatisticas(self):
         """
@@ -104,7 +199,8 @@ class Agent:
         Returns:
             list: Lista de tuplas (x, y) representando o caminho
         """
-        return [(no.x, no.y) for no in self.caminho_percorrido]
+        # zip em nível C sobre os buffers tipados, sem tocar nos objetos No
+        return list(zip(self._caminho_xs, self._caminho_ys))
         
     def simular_caminho(self, caminho_nos, grafo):
         """
@@ -119,22 +215,20 @@ class Agent:
         """
         if not caminho_nos or caminho_nos[0] != self.posicao_inicial:
             return False
-            
+
         self.resetar_estado()
-        
+
+        # Caminho trivial (um único nó): nada a simular
+        if len(caminho_nos) == 1:
+            return True
+
         for i in range(1, len(caminho_nos)):
             no_anterior = caminho_nos[i-1]
             no_atual = caminho_nos[i]
-            
-            # Encontra o custo do movimento entre os nós
-            vizinhos = grafo.obter_vizinhos(no_anterior)
-            custo_movimento = None
-            
-            for vizinho, custo in vizinhos:
-                if vizinho == no_atual:
-                    custo_movimento = custo
-                    break
-                    
+
+            # Custo do movimento em O(1) via dicionário de vizinhos memoizado
+            custo_movimento = grafo.obter_vizinhos_dict(no_anterior).get(no_atual)
+
             if custo_movimento is None:
                 # Nós não são adjacentes - caminho inválido
                 return False
@@ -157,7 +251,9 @@ class AgentEstado:
     Classe para capturar um estado específico do agente
     Útil para algoritmos de busca que precisam rastrear estados
     """
-    
+
+    __slots__ = ('no', 'custo_g', 'custo_f', 'pai', '_desempate', '_hash')
+
     def __init__(self, no, custo_g=0, custo_f=0, pai=None):
         """
         Inicializa um estado do agente
@@ -172,7 +268,13 @@ class AgentEstado:
         self.custo_g = custo_g
         self.custo_f = custo_f
         self.pai = pai
-        
+        # Desempate inteiro precalculado: evita montar tuplas de coordenadas
+        # a cada comparação no heap
+        self._desempate = (no.x << 32) | no.y
+        # Hash memoizado: evita redespachar hash(no) a cada sondagem
+        # em sets/dicionários de estados
+        self._hash = hash(no)
+
     def reconstruir_caminho(self):
         """
         Reconstrói o caminho desde o estado inicial até este estado
@@ -180,27 +282,34 @@ class AgentEstado:
         Returns:
             list: Lista de nós do caminho
         """
-        caminho = []
+        # deque com appendleft monta o caminho já na ordem final,
+        # sem a lista intermediária + passada de reversão
+        caminho = deque()
         estado_atual = self
-        
+
         while estado_atual is not None:
-            caminho.append(estado_atual.no)
+            caminho.appendleft(estado_atual.no)
             estado_atual = estado_atual.pai
-            
-        return list(reversed(caminho))
+
+        return list(caminho)
         
     def __eq__(self, other):
-        return isinstance(other, AgentEstado) and self.no == other.no
+        # Os nós são únicos no grafo, então comparar identidade basta;
+        # o try/except cobre comparações com outros tipos sem isinstance
+        try:
+            return self.no is other.no or self.no == other.no
+        except AttributeError:
+            return NotImplemented
         
     def __hash__(self):
-        return hash(self.no)
+        return self._hash
         
     def __lt__(self, other):
         """Comparação para fila de prioridade (menor custo_f tem prioridade)"""
         if self.custo_f != other.custo_f:
             return self.custo_f < other.custo_f
-        # Desempate por coordenadas para consistência
-        return (self.no.x, self.no.y) < (other.no.x, other.no.y)
+        # Desempate pelo inteiro precalculado (mesma ordem que (x, y))
+        return self._desempate < other._desempate
         
     def __str__(self):
         pos = f"({self.no.x}, {self.no.y})"
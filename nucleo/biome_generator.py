@@ -5,6 +5,7 @@ Mapeia valores contínuos para diferentes tipos de terreno.
 
 import random
 import math
+from bisect import bisect_right
 from enum import Enum
 import config
 
@@ -21,26 +22,64 @@ class TipoTerreno(Enum):
         self.simbolo = simbolo
 
 
+# Parâmetros do hash FNV-1 de 32 bits (variante sem tabela de permutação)
+_FNV_OFFSET = 2166136261
+_FNV_PRIMO = 16777619
+
+
+def _fnv1_32(valor, h=_FNV_OFFSET):
+    """
+    Rodada do hash FNV-1 de 32 bits: multiplica o acumulador pelo primo
+    e mistura o valor por XOR. Passar o resultado de uma rodada como `h`
+    da próxima encadeia o hash sobre vários valores, fazendo a
+    multiplicação atuar sobre o estado já dependente das entradas
+    anteriores (sem isso o hash degenera em `constante ^ valor`).
+    """
+    return ((h * _FNV_PRIMO) & 0xFFFFFFFF) ^ (valor & 0xFFFFFFFF)
+
+
+# Constantes de inclinação/desinclinação do simplex 2D (forma de Gustavson)
+_SIMPLEX_F2 = 0.5 * (math.sqrt(3.0) - 1.0)
+_SIMPLEX_G2 = (3.0 - math.sqrt(3.0)) / 6.0
+
+
 class PerlinNoise:
     """
     Implementação simplificada de Perlin Noise para geração de biomas.
     Baseada no algoritmo clássico de Ken Perlin.
+    Também oferece ruído simplex 2D (3 cantos em vez de 4, uma
+    interpolação a menos) via algoritmo='simplex'.
     """
-    
-    def __init__(self, seed=None):
+
+    def __init__(self, seed=None, algoritmo='perlin'):
         if seed is not None:
             random.seed(seed)
-        
+
         # Tabela de permutação para Perlin Noise
         self.permutation = list(range(256))
         random.shuffle(self.permutation)
         self.permutation *= 2  # Duplica para evitar overflow
-        
+
         # Vetores de gradiente 2D
         self.gradients = [
             (1, 1), (-1, 1), (1, -1), (-1, -1),
             (1, 0), (-1, 0), (0, 1), (0, -1)
         ]
+
+        # Índice de gradiente pré-reduzido (perm[i] & 7) e componentes
+        # x/y separados: elimina o módulo e o desempacotamento de tupla
+        # por canto no caminho quente
+        self.perm_mod8 = bytes(p & 7 for p in self.permutation)
+        self.gx = tuple(g[0] for g in self.gradients)
+        self.gy = tuple(g[1] for g in self.gradients)
+
+        # 'perlin' permanece o padrão para preservar os mapas das
+        # sementes existentes; 'simplex' troca o avaliador por amostra
+        self.algoritmo = algoritmo
+
+        # Variante opcional sem tabela: deriva o gradiente de um hash
+        # FNV-1 das coordenadas inteiras (muda os mapas gerados!)
+        self.usar_hash_fnv = False
     
     def fade(self, t):
         """Função de suavização para Perlin Noise"""
@@ -52,8 +91,8 @@ class PerlinNoise:
     
     def grad(self, hash_val, x, y):
         """Função de gradiente para Perlin Noise"""
-        gradient = self.gradients[hash_val % len(self.gradients)]
-        return gradient[0] * x + gradient[1] * y
+        h = hash_val & 7
+        return self.gx[h] * x + self.gy[h] * y
     
     def noise(self, x, y):
         """
@@ -66,33 +105,155 @@ class PerlinNoise:
         Returns:
             float: Valor entre -1 e 1
         """
+        # Caminho quente escrito sem despachos de método (fade/lerp/grad
+        # embutidos) e com a tabela de permutação ligada a um local
+        perm = self.permutation
+        perm_mod8 = self.perm_mod8
+        gx = self.gx
+        gy = self.gy
+
         # Encontra célula da grade
-        X = int(x) & 255
-        Y = int(y) & 255
-        
+        xi = int(x)
+        yi = int(y)
+        X = xi & 255
+        Y = yi & 255
+
         # Posições relativas dentro da célula
-        x -= int(x)
-        y -= int(y)
-        
+        x -= xi
+        y -= yi
+
         # Calcula curvas de suavização
-        u = self.fade(x)
-        v = self.fade(y)
-        
+        u = x * x * x * (x * (x * 6 - 15) + 10)
+        v = y * y * y * (y * (y * 6 - 15) + 10)
+
         # Hash das coordenadas dos 4 cantos da célula
-        A = self.permutation[X] + Y
-        AA = self.permutation[A]
-        AB = self.permutation[A + 1]
-        B = self.permutation[X + 1] + Y
-        BA = self.permutation[B]
-        BB = self.permutation[B + 1]
-        
-        # Interpola os resultados dos 4 cantos
-        return self.lerp(v,
-            self.lerp(u, self.grad(self.permutation[AA], x, y),
-                         self.grad(self.permutation[BA], x - 1, y)),
-            self.lerp(u, self.grad(self.permutation[AB], x, y - 1),
-                         self.grad(self.permutation[BB], x - 1, y - 1)))
+        A = perm[X] + Y
+        B = perm[X + 1] + Y
+        h_aa = perm_mod8[perm[A]]
+        h_ba = perm_mod8[perm[B]]
+        h_ab = perm_mod8[perm[A + 1]]
+        h_bb = perm_mod8[perm[B + 1]]
+
+        # Produtos escalares dos 4 cantos e interpolação bilinear
+        n0 = gx[h_aa] * x + gy[h_aa] * y
+        n1 = gx[h_ba] * (x - 1) + gy[h_ba] * y
+        n2 = gx[h_ab] * x + gy[h_ab] * (y - 1)
+        n3 = gx[h_bb] * (x - 1) + gy[h_bb] * (y - 1)
+
+        nx0 = n0 + u * (n1 - n0)
+        nx1 = n2 + u * (n3 - n2)
+        return nx0 + v * (nx1 - nx0)
     
+    def noise_fnv(self, x, y):
+        """
+        Variante de noise() que deriva os gradientes de um hash FNV-1
+        das coordenadas inteiras, sem tocar na tabela de permutação.
+        Produz campos diferentes da variante com tabela — útil apenas
+        quando reprodutibilidade das sementes atuais não importa.
+
+        Args:
+            x (float): Coordenada X
+            y (float): Coordenada Y
+
+        Returns:
+            float: Valor entre -1 e 1
+        """
+        gx = self.gx
+        gy = self.gy
+
+        xi = int(x)
+        yi = int(y)
+
+        x -= xi
+        y -= yi
+
+        u = x * x * x * (x * (x * 6 - 15) + 10)
+        v = y * y * y * (y * (y * 6 - 15) + 10)
+
+        # Hash encadeado das coordenadas de cada canto: o hash de X vira
+        # o acumulador da rodada de Y, então cada coordenada passa por
+        # uma multiplicação própria e o índice de gradiente não colapsa
+        # em função de xi ^ yi
+        h_x0 = _fnv1_32(xi)
+        h_x1 = _fnv1_32(xi + 1)
+        h_aa = _fnv1_32(yi, h_x0) & 7
+        h_ab = _fnv1_32(yi + 1, h_x0) & 7
+        h_ba = _fnv1_32(yi, h_x1) & 7
+        h_bb = _fnv1_32(yi + 1, h_x1) & 7
+
+        n0 = gx[h_aa] * x + gy[h_aa] * y
+        n1 = gx[h_ba] * (x - 1) + gy[h_ba] * y
+        n2 = gx[h_ab] * x + gy[h_ab] * (y - 1)
+        n3 = gx[h_bb] * (x - 1) + gy[h_bb] * (y - 1)
+
+        nx0 = n0 + u * (n1 - n0)
+        nx1 = n2 + u * (n3 - n2)
+        return nx0 + v * (nx1 - nx0)
+
+    def noise_simplex(self, x, y):
+        """
+        Gera valor de ruído simplex 2D para coordenadas (x, y)
+
+        Mais barato que o Perlin clássico: três contribuições de canto
+        e nenhuma interpolação bilinear.
+
+        Args:
+            x (float): Coordenada X
+            y (float): Coordenada Y
+
+        Returns:
+            float: Valor aproximadamente entre -1 e 1
+        """
+        perm = self.permutation
+        perm_mod8 = self.perm_mod8
+        gx = self.gx
+        gy = self.gy
+
+        # Inclina o espaço para localizar a célula simplex
+        s = (x + y) * _SIMPLEX_F2
+        i = math.floor(x + s)
+        j = math.floor(y + s)
+        t = (i + j) * _SIMPLEX_G2
+        x0 = x - (i - t)
+        y0 = y - (j - t)
+
+        # Qual dos dois triângulos da célula contém o ponto
+        if x0 > y0:
+            i1, j1 = 1, 0
+        else:
+            i1, j1 = 0, 1
+
+        x1 = x0 - i1 + _SIMPLEX_G2
+        y1 = y0 - j1 + _SIMPLEX_G2
+        x2 = x0 - 1.0 + 2.0 * _SIMPLEX_G2
+        y2 = y0 - 1.0 + 2.0 * _SIMPLEX_G2
+
+        ii = int(i) & 255
+        jj = int(j) & 255
+
+        n = 0.0
+
+        t0 = 0.5 - x0 * x0 - y0 * y0
+        if t0 > 0:
+            h = perm_mod8[ii + perm[jj]]
+            t0 *= t0
+            n += t0 * t0 * (gx[h] * x0 + gy[h] * y0)
+
+        t1 = 0.5 - x1 * x1 - y1 * y1
+        if t1 > 0:
+            h = perm_mod8[ii + i1 + perm[jj + j1]]
+            t1 *= t1
+            n += t1 * t1 * (gx[h] * x1 + gy[h] * y1)
+
+        t2 = 0.5 - x2 * x2 - y2 * y2
+        if t2 > 0:
+            h = perm_mod8[ii + 1 + perm[jj + 1]]
+            t2 *= t2
+            n += t2 * t2 * (gx[h] * x2 + gy[h] * y2)
+
+        # Escala empírica para aproximar a faixa [-1, 1]
+        return 70.0 * n
+
     def octave_noise(self, x, y, octaves=4, persistence=0.5, scale=0.1):
         """
         Gera ruído com múltiplas oitavas para maior realismo
@@ -110,9 +271,16 @@ class PerlinNoise:
         amplitude = 1
         frequency = scale
         max_value = 0
-        
+
+        if self.algoritmo != 'perlin':
+            funcao_ruido = self.noise_simplex
+        elif self.usar_hash_fnv:
+            funcao_ruido = self.noise_fnv
+        else:
+            funcao_ruido = self.noise
+
         for _ in range(octaves):
-            value += self.noise(x * frequency, y * frequency) * amplitude
+            value += funcao_ruido(x * frequency, y * frequency) * amplitude
             max_value += amplitude
             amplitude *= persistence
             frequency *= 2
@@ -124,8 +292,8 @@ class PerlinNoise:
 class BiomeGenerator:
     """Gera biomas naturais usando Perlin Noise"""
     
-    def __init__(self, seed=None):
-        self.noise_generator = PerlinNoise(seed)
+    def __init__(self, seed=None, algoritmo='perlin'):
+        self.noise_generator = PerlinNoise(seed, algoritmo=algoritmo)
         
         # Configurações dos biomas carregadas do config
         self.biome_ranges = []
@@ -137,6 +305,13 @@ class BiomeGenerator:
                 # Fallback seguro caso configuração esteja errada
                 print(f"AVISO: Tipo de terreno '{nome_terreno}' não encontrado. Usando SOLIDO.")
                 self.biome_ranges.append((min_val, max_val, TipoTerreno.SOLIDO))
+
+        # Faixas pré-ordenadas para classificação por busca binária em vez
+        # da varredura linear por célula
+        faixas_ordenadas = sorted(self.biome_ranges, key=lambda faixa: faixa[0])
+        self._limites_max = [faixa[1] for faixa in faixas_ordenadas]
+        self._minimos = [faixa[0] for faixa in faixas_ordenadas]
+        self._terrenos = [faixa[2] for faixa in faixas_ordenadas]
     
     def generate_biome_map(self, width, height, scale=config.BIOMA_ESCALA, octaves=config.BIOMA_OITAVAS):
         """
@@ -150,35 +325,131 @@ class BiomeGenerator:
         Returns:
             list[list[TipoTerreno]]: Matriz de tipos de terreno
         """
+        # Versão "vetorizada" em Python puro: o ruído de cada célula só
+        # depende de (x*freq) e (y*freq), então os termos por coluna e por
+        # linha de cada oitava são pré-calculados uma única vez em vez de
+        # refeitos width*height*octaves vezes dentro de octave_noise
+        gerador = self.noise_generator
+
+        # O laço embutido abaixo reproduz o Perlin clássico com tabela;
+        # simplex e a variante FNV usam o avaliador por amostra
+        if gerador.algoritmo != 'perlin' or gerador.usar_hash_fnv:
+            mapear = self._map_noise_to_terrain
+            return [
+                [mapear(gerador.octave_noise(x, y, octaves=octaves, scale=scale))
+                 for x in range(width)]
+                for y in range(height)
+            ]
+
+        perm = gerador.permutation
+        perm_mod8 = gerador.perm_mod8
+        gx = gerador.gx
+        gy = gerador.gy
+        fade = gerador.fade
+        mapear = self._map_noise_to_terrain
+
+        # Amplitudes e frequências de cada oitava
+        amplitudes = []
+        frequencias = []
+        amplitude = 1
+        frequency = scale
+        max_value = 0
+        for _ in range(octaves):
+            amplitudes.append(amplitude)
+            frequencias.append(frequency)
+            max_value += amplitude
+            amplitude *= 0.5  # mesma persistência padrão de octave_noise
+            frequency *= 2
+
+        # Dados por coluna (dependem só de x e da oitava):
+        # (X & 255, parte fracionária, curva de suavização u)
+        colunas = []
+        for freq in frequencias:
+            col = []
+            for x in range(width):
+                xa = x * freq
+                xi = int(xa)
+                xf = xa - xi
+                col.append((xi & 255, xf, fade(xf)))
+            colunas.append(col)
+
         biome_map = []
-        
+        inv_max = 1.0 / max_value
+
         for y in range(height):
+            # Dados por linha de cada oitava: (Y & 255, yf, v)
+            linhas = []
+            for freq in frequencias:
+                ya = y * freq
+                yi = int(ya)
+                yf = ya - yi
+                linhas.append((yi & 255, yf, fade(yf)))
+
             row = []
             for x in range(width):
-                # Gera valor de ruído para posição
-                noise_value = self.noise_generator.octave_noise(
-                    x, y, octaves=octaves, scale=scale
-                )
-                
-                # Mapeia valor para tipo de terreno
-                terrain_type = self._map_noise_to_terrain(noise_value)
-                row.append(terrain_type)
-            
+                value = 0.0
+                for o in range(octaves):
+                    X, xf, u = colunas[o][x]
+                    Y, yf, v = linhas[o]
+
+                    # Hash dos 4 cantos da célula (mesmo esquema de noise())
+                    A = perm[X] + Y
+                    B = perm[X + 1] + Y
+                    h_aa = perm_mod8[perm[A]]
+                    h_ba = perm_mod8[perm[B]]
+                    h_ab = perm_mod8[perm[A + 1]]
+                    h_bb = perm_mod8[perm[B + 1]]
+
+                    n0 = gx[h_aa] * xf + gy[h_aa] * yf
+                    n1 = gx[h_ba] * (xf - 1) + gy[h_ba] * yf
+                    n2 = gx[h_ab] * xf + gy[h_ab] * (yf - 1)
+                    n3 = gx[h_bb] * (xf - 1) + gy[h_bb] * (yf - 1)
+
+                    nx0 = n0 + u * (n1 - n0)
+                    nx1 = n2 + u * (n3 - n2)
+                    value += (nx0 + v * (nx1 - nx0)) * amplitudes[o]
+
+                noise_value = (value * inv_max + 1) * 0.5
+                row.append(mapear(noise_value))
+
             biome_map.append(row)
-        
+
         return biome_map
     
     def _map_noise_to_terrain(self, noise_value):
-        """Mapeia valor de ruído para tipo de terreno"""
-        for min_val, max_val, terrain_type in self.biome_ranges:
-            if min_val <= noise_value < max_val:
-                return terrain_type
-        
+        """Mapeia valor de ruído para tipo de terreno (busca binária)"""
+        # Primeira faixa cujo limite superior é maior que o valor
+        idx = bisect_right(self._limites_max, noise_value)
+        if idx < len(self._terrenos) and self._minimos[idx] <= noise_value:
+            return self._terrenos[idx]
+
         # Fallback para último tipo se valor estiver fora do range
         if self.biome_ranges:
             return self.biome_ranges[-1][2]
         return TipoTerreno.SOLIDO
     
+    def generate_biome_for_positions(self, posicoes, scale=config.BIOMA_ESCALA, octaves=config.BIOMA_OITAVAS):
+        """
+        Gera biomas apenas para as posições pedidas
+
+        Para labirintos esparsos evita calcular ruído no retângulo
+        inteiro; cada célula recebe o mesmo valor que teria no mapa cheio.
+
+        Args:
+            posicoes (iterable): Coordenadas (x, y) a classificar
+            scale (float): Escala do ruído
+            octaves (int): Complexidade
+
+        Returns:
+            dict: {(x, y): TipoTerreno}
+        """
+        octave_noise = self.noise_generator.octave_noise
+        mapear = self._map_noise_to_terrain
+        return {
+            (x, y): mapear(octave_noise(x, y, octaves=octaves, scale=scale))
+            for x, y in posicoes
+        }
+
     def generate_biome_for_position(self, x, y, scale=config.BIOMA_ESCALA, octaves=config.BIOMA_OITAVAS):
         """
         Gera bioma para posição específica
@@ -227,26 +498,91 @@ class BiomeGenerator:
         }
 
 
+# Cache de mapas de bioma por parâmetros: reexecuções com a mesma semente
+# e dimensões (testes, novo ambiente com seed fixa) pulam todo o ruído
+_cache_biomas = {}
+_CACHE_BIOMAS_MAX = 16
+
+
+def limpar_cache_biomas():
+    """Limpa o cache de mapas de bioma"""
+    _cache_biomas.clear()
+
+
 def gerar_biomas_naturais(width, height, seed=None, scale=config.BIOMA_ESCALA, octaves=config.BIOMA_OITAVAS):
     """
     Função utilitária para gerar biomas naturais
-    
+
+    Resultados de chamadas com semente fixa são memoizados por
+    (width, height, seed, scale, octaves); seed=None nunca é cacheada.
+
     Args:
         width, height (int): Dimensões
         seed (int): Semente para reprodução
         scale (float): Suavidade do terreno (0.05 = muito suave, 0.2 = muito variado)
         octaves (int): Complexidade (mais oitavas = mais detalhes)
-        
+
     Returns:
         tuple: (biome_map, statistics) onde biome_map é matriz de TipoTerreno
     """
+    chave = (width, height, seed, scale, octaves)
+    if seed is not None and chave in _cache_biomas:
+        # Reproduz os efeitos colaterais de BiomeGenerator(seed) no RNG
+        # global (reseed + shuffle da tabela de permutação de 256
+        # entradas): sem isso, sorteios posteriores do chamador — nós
+        # inicial/objetivo, recompensas — divergiriam entre a primeira
+        # geração (cache vazio) e as seguintes, quebrando o contrato de
+        # reprodutibilidade de config.SEED
+        random.seed(seed)
+        random.shuffle(list(range(256)))
+        biome_map, statistics = _cache_biomas[chave]
+        # Cópias rasas: o chamador pode mexer nas linhas sem sujar o cache
+        return [row[:] for row in biome_map], dict(statistics)
+
     generator = BiomeGenerator(seed)
     biome_map = generator.generate_biome_map(width, height, scale, octaves)
     statistics = generator.get_biome_statistics(biome_map)
-    
+
+    if seed is not None:
+        if len(_cache_biomas) >= _CACHE_BIOMAS_MAX:
+            _cache_biomas.clear()
+        _cache_biomas[chave] = ([row[:] for row in biome_map], dict(statistics))
+
     return biome_map, statistics
 
 
+def gerar_biomas_para_posicoes(posicoes, seed=None, scale=config.BIOMA_ESCALA, octaves=config.BIOMA_OITAVAS):
+    """
+    Gera biomas apenas para um conjunto esparso de posições
+
+    Cada célula recebe o mesmo terreno que teria em gerar_biomas_naturais
+    com os mesmos parâmetros; só se paga o ruído das posições pedidas.
+
+    Args:
+        posicoes (iterable): Coordenadas (x, y)
+        seed (int): Semente para reprodução
+        scale (float): Suavidade do terreno
+        octaves (int): Complexidade
+
+    Returns:
+        tuple: (biome_map, statistics) onde biome_map é dict {(x, y): TipoTerreno}
+    """
+    generator = BiomeGenerator(seed)
+    biome_map = generator.generate_biome_for_positions(posicoes, scale, octaves)
+
+    # Estatísticas no mesmo formato de get_biome_statistics
+    counts = {terrain_type: 0 for terrain_type in TipoTerreno}
+    for terrain in biome_map.values():
+        counts[terrain] += 1
+    total = len(biome_map)
+    percentages = {
+        terrain: (count / total) * 100 if total > 0 else 0
+        for terrain, count in counts.items()
+    }
+
+    return biome_map, {'counts': counts, 'percentages': percentages, 'total': total}
+
+
 # Teste básico do módulo
 if __name__ == "__main__":
     print("Testando gerador de biomas...")
@@ -261,3 +597,21 @@ if __name__ == "__main__":
     print(f"\nEstatísticas:")
     for terrain, percentage in stats['percentages'].items():
         print(f"  {terrain.name}: {percentage:.1f}% ({stats['counts'][terrain]} células)")
+
+    # Sanidade do hash FNV: o índice de gradiente não pode ser função
+    # pura de xi ^ yi (um hash degenerado produziria campos periódicos
+    # correlacionados com os eixos)
+    indices_por_xor = {}
+    degenerado = True
+    for xi in range(32):
+        for yi in range(32):
+            indice = _fnv1_32(yi, _fnv1_32(xi)) & 7
+            chave = xi ^ yi
+            if chave in indices_por_xor and indices_por_xor[chave] != indice:
+                degenerado = False
+                break
+            indices_por_xor[chave] = indice
+        if not degenerado:
+            break
+    assert not degenerado, "Hash FNV degenerado: gradiente depende só de xi ^ yi"
+    print("\nHash FNV: índice de gradiente não é função de xi ^ yi [OK]")
@@ -4,33 +4,43 @@ Integra geração de labirintos com biomas naturais e distribuição inteligente
 """
 
 from collections import defaultdict, deque
+from array import array
 import random
 import math
 import config
 
 from .maze_generator import gerar_labirinto_conectado
-from .biome_generator import gerar_biomas_naturais, TipoTerreno
+from .biome_generator import gerar_biomas_naturais, gerar_biomas_para_posicoes, TipoTerreno
 
 
 class No:
     """Representa um nó (vértice) no grafo"""
-    
+
+    # Sem __dict__ por instância: nós de grades grandes ficam ~3x menores
+    # e o acesso a atributo vira leitura direta de slot. `idx` é o índice
+    # plano atribuído por Graph.construir_indice_plano.
+    #
+    # Igualdade e hash ficam com a semântica padrão de identidade: cada
+    # (x, y) tem exatamente uma instância canônica, guardada em Graph.nos
+    # (só adicionar_no constrói No), então comparar ponteiros equivale a
+    # comparar coordenadas e dispensa o hash de tupla nos sets/dicts das
+    # buscas
+    __slots__ = ('x', 'y', 'tipo_terreno', 'custo', 'tem_recompensa',
+                 'recompensa_coletada', 'idx')
+
     def __init__(self, x, y, tipo_terreno=TipoTerreno.SOLIDO):
         self.x = x
         self.y = y
         self.tipo_terreno = tipo_terreno
+        # Custo materializado no nó: evita a cadeia de descritores do Enum
+        # (tipo_terreno.custo) a cada aresta criada ou consultada
+        self.custo = tipo_terreno.custo
         self.tem_recompensa = False
         self.recompensa_coletada = False
-        
+
     def __str__(self):
         return f"No({self.x}, {self.y}, {self.tipo_terreno.name})"
-        
-    def __eq__(self, other):
-        return isinstance(other, No) and self.x == other.x and self.y == other.y
-        
-    def __hash__(self):
-        return hash((self.x, self.y))
-        
+
     def obter_simbolo(self):
         """Retorna o símbolo visual do nó"""
         if self.tem_recompensa and not self.recompensa_coletada:
@@ -44,8 +54,11 @@ class Graph:
     """Representa o grafo avançado do ambiente com labirinto e biomas"""
     
     def __init__(self):
-        self.nos = {}  # Dicionário {(x, y): No}
-        self.adjacencias = defaultdict(list)  # {no: [(vizinho, custo), ...]}
+        # Dicionário {(y << 16) | x: No}: a chave empacotada num único
+        # inteiro evita alocar (e hashear) uma tupla por consulta —
+        # o hash de int pequeno é a identidade
+        self.nos = {}
+        self.adjacencias = defaultdict(dict)  # {no: {vizinho: custo}}
         self.largura = 0
         self.altura = 0
         
@@ -55,18 +68,40 @@ class Graph:
         self.caminho_garantido = []
         self.recompensas_caminho_principal = []
         self.recompensas_areas_extras = []
-        
+
+        # Representação plana (arrays) construída sob demanda para as buscas
+        self._indice_plano = None
+        self._custo_medio_cache = None
+        self._nos_recompensa_cache = None
+        self._conectividade_cache = None
+
+        # Tabelas de heurística por objetivo, preenchidas por
+        # algoritmos.heuristics. Moram no grafo (e não num dicionário
+        # global) para serem invalidadas junto com o índice plano quando
+        # a topologia muda
+        self._heuristicas_cache = {}
+
+        # Arrays paralelos por nó (SoA), preenchidos por construir_indice_plano
+        self.xs = None
+        self.ys = None
+        self.custos_no = None
+
     def adicionar_no(self, x, y, tipo_terreno=TipoTerreno.SOLIDO):
         """Adiciona um nó ao grafo"""
         no = No(x, y, tipo_terreno)
-        self.nos[(x, y)] = no
+        self.nos[(y << 16) | x] = no
         self.largura = max(self.largura, x + 1)
         self.altura = max(self.altura, y + 1)
+        self._indice_plano = None
+        self._custo_medio_cache = None
+        self._nos_recompensa_cache = None
+        self._conectividade_cache = None
+        self._heuristicas_cache.clear()
         return no
         
     def obter_no(self, x, y):
         """Retorna o nó nas coordenadas especificadas"""
-        return self.nos.get((x, y))
+        return self.nos.get((y << 16) | x)
     
     def obter_todos_nos(self):
         """Retorna todos os nós atualmente cadastrados no grafo"""
@@ -74,32 +109,123 @@ class Graph:
         
     def conectar_nos(self, no1, no2):
         """Conecta dois nós considerando o custo do terreno de destino"""
-        if no1 not in self.nos.values() or no2 not in self.nos.values():
+        # Consulta O(1) no dicionário por coordenada em vez de varrer values()
+        if (self.nos.get((no1.y << 16) | no1.x) is not no1 or
+                self.nos.get((no2.y << 16) | no2.x) is not no2):
             return False
             
-        # Custo é baseado no terreno de destino
-        custo = no2.tipo_terreno.custo
-        self.adjacencias[no1].append((no2, custo))
-        
+        # Custo é baseado no terreno de destino; o dicionário interno
+        # deduplica arestas repetidas automaticamente
+        self.adjacencias[no1][no2] = no2.custo
+
         # Conecta bidirecionalmente
-        custo_reverso = no1.tipo_terreno.custo
-        self.adjacencias[no2].append((no1, custo_reverso))
-        
+        self.adjacencias[no2][no1] = no1.custo
+
+        self._indice_plano = None
+        self._conectividade_cache = None
+        self._heuristicas_cache.clear()
         return True
+
+    def construir_indice_plano(self):
+        """
+        Constrói (e memoiza) a representação plana do grafo em arrays.
+
+        Cada nó recebe um índice inteiro 0..N-1 (atributo `idx`) e as
+        adjacências são achatadas no formato CSR: os vizinhos do nó i ficam
+        em viz_idx[viz_inicio[i]:viz_inicio[i+1]], com custos paralelos em
+        viz_custo. Isso permite que os algoritmos de busca trabalhem apenas
+        com inteiros e floats, sem alocar objetos no laço quente.
+
+        Também preenche os arrays paralelos por nó (layout SoA) `xs`, `ys` e
+        `custos_no`, indexados pelo mesmo índice plano, para que heurísticas
+        leiam coordenadas e custos sem acessos a atributos de objeto.
+
+        Returns:
+            tuple: (nos_ordenados, indice_no, viz_inicio, viz_idx, viz_custo)
+        """
+        if self._indice_plano is not None:
+            return self._indice_plano
+
+        nos_ordenados = list(self.nos.values())
+        indice_no = {}
+        self.xs = array('i')
+        self.ys = array('i')
+        self.custos_no = array('i')
+        for i, no in enumerate(nos_ordenados):
+            no.idx = i
+            indice_no[no] = i
+            self.xs.append(no.x)
+            self.ys.append(no.y)
+            self.custos_no.append(no.custo)
+
+        viz_inicio = array('i', [0])
+        viz_idx = array('i')
+        viz_custo = array('d')
+
+        for no in nos_ordenados:
+            for vizinho, custo in self.adjacencias.get(no, {}).items():
+                viz_idx.append(indice_no[vizinho])
+                viz_custo.append(custo)
+            viz_inicio.append(len(viz_idx))
+
+        self._indice_plano = (nos_ordenados, indice_no, viz_inicio, viz_idx, viz_custo)
+        return self._indice_plano
         
     def obter_vizinhos(self, no):
         """Retorna lista de pares (vizinho, custo) conectados ao nó."""
-        return self.adjacencias.get(no, [])
+        vizinhos = self.adjacencias.get(no)
+        return list(vizinhos.items()) if vizinhos else []
+
+    def obter_vizinhos_dict(self, no):
+        """
+        Retorna os vizinhos do nó como dicionário {vizinho: custo}
+
+        Permite consultar o custo de uma aresta específica em O(1) em vez de
+        varrer a lista de adjacência. O dicionário é o armazenamento interno
+        do grafo — tratar como somente leitura.
+        """
+        return self.adjacencias.get(no, {})
+
     def obter_custo_aresta(self, no1, no2):
-        """Retorna custo da aresta entre dois nós"""
-        for vizinho, custo in self.adjacencias[no1]:
-            if vizinho == no2:
-                return custo
-        return float('inf')
+        """Retorna custo da aresta entre dois nós em O(1)"""
+        vizinhos = self.adjacencias.get(no1)
+        if vizinhos is None:
+            return float('inf')
+        return vizinhos.get(no2, float('inf'))
         
+    def obter_custo_medio_terreno(self):
+        """Retorna o custo médio de terreno dos nós (memoizado)"""
+        if self._custo_medio_cache is None:
+            if not self.nos:
+                return 0
+            custo_total = sum(no.custo for no in self.nos.values())
+            self._custo_medio_cache = custo_total / len(self.nos)
+        return self._custo_medio_cache
+
+    def definir_recompensa(self, no):
+        """
+        Marca um nó como portador de recompensa, mantendo o cache coerente
+
+        Preferir este método a atribuir no.tem_recompensa direto.
+        """
+        if not no.tem_recompensa:
+            no.tem_recompensa = True
+            if self._nos_recompensa_cache is not None:
+                self._nos_recompensa_cache.append(no)
+
     def obter_nos_com_recompensa(self):
-        """Retorna lista de nós que têm recompensas"""
-        return [no for no in self.nos.values() if no.tem_recompensa]
+        """Retorna lista de nós que têm recompensas (memoizada)"""
+        if self._nos_recompensa_cache is None:
+            self._nos_recompensa_cache = [no for no in self.nos.values()
+                                          if no.tem_recompensa]
+        return list(self._nos_recompensa_cache)
+
+    def contar_recompensas(self):
+        """Conta os nós com recompensa sem varrer o grafo"""
+        if self._nos_recompensa_cache is None:
+            self._nos_recompensa_cache = [no for no in self.nos.values()
+                                          if no.tem_recompensa]
+        return len(self._nos_recompensa_cache)
         
     def resetar_recompensas(self):
         """Reseta estado de coleta das recompensas"""
@@ -107,24 +233,40 @@ class Graph:
             no.recompensa_coletada = False
             
     def validar_conectividade(self):
-        """Valida se todos os nós são alcançáveis usando BFS"""
+        """Valida se todos os nós são alcançáveis usando BFS (memoizado)"""
         if not self.nos:
             return False
-            
-        # Pega primeiro nó como início
-        inicio = next(iter(self.nos.values()))
-        visitados = set()
-        fila = deque([inicio])
-        visitados.add(inicio)
-        
-        while fila:
-            no_atual = fila.popleft()
-            for vizinho, _ in self.obter_vizinhos(no_atual):
-                if vizinho not in visitados:
-                    visitados.add(vizinho)
-                    fila.append(vizinho)
-        
-        return len(visitados) == len(self.nos)
+
+        # O resultado vale enquanto a topologia não muda: validação do
+        # ambiente e estatísticas do relatório reutilizam a mesma BFS
+        if self._conectividade_cache is not None:
+            return self._conectividade_cache
+
+        # BFS sobre o índice plano (CSR): só inteiros no laço quente,
+        # com visitados em bytearray e fila em array pré-alocado indexado
+        # por cabeça/cauda — sem sets, deques ou objetos No
+        _, _, viz_inicio, viz_idx, _ = self.construir_indice_plano()
+        n = len(self.nos)
+        visitado = bytearray(n)
+        fila = array('i', bytes(4 * n))
+        fila[0] = 0
+        visitado[0] = 1
+        cabeca, cauda = 0, 1
+        contagem = 1
+
+        while cabeca < cauda:
+            atual = fila[cabeca]
+            cabeca += 1
+            for k in range(viz_inicio[atual], viz_inicio[atual + 1]):
+                viz = viz_idx[k]
+                if not visitado[viz]:
+                    visitado[viz] = 1
+                    fila[cauda] = viz
+                    cauda += 1
+                    contagem += 1
+
+        self._conectividade_cache = contagem == n
+        return self._conectividade_cache
         
     def calcular_caminho_garantido(self, inicio, objetivo):
         """
@@ -136,25 +278,31 @@ class Graph:
         Returns:
             list[No]: Caminho do início ao objetivo, ou lista vazia se não há caminho
         """
-        if inicio not in self.nos.values() or objetivo not in self.nos.values():
+        if (self.nos.get((inicio.y << 16) | inicio.x) is not inicio or
+                self.nos.get((objetivo.y << 16) | objetivo.x) is not objetivo):
             return []
             
-        fila = deque([(inicio, [inicio])])
-        visitados = {inicio}
-        
+        # BFS com ponteiros de pai: o caminho é reconstruído uma única vez
+        # no final, em vez de copiar a lista parcial a cada expansão
+        pai = {inicio: None}
+        fila = deque([inicio])
+
         while fila:
-            no_atual, caminho = fila.popleft()
-            
+            no_atual = fila.popleft()
+
             if no_atual == objetivo:
-                self.caminho_garantido = caminho
-                return caminho
-                
+                caminho = deque()
+                while no_atual is not None:
+                    caminho.appendleft(no_atual)
+                    no_atual = pai[no_atual]
+                self.caminho_garantido = list(caminho)
+                return self.caminho_garantido
+
             for vizinho, _ in self.obter_vizinhos(no_atual):
-                if vizinho not in visitados:
-                    visitados.add(vizinho)
-                    novo_caminho = caminho + [vizinho]
-                    fila.append((vizinho, novo_caminho))
-        
+                if vizinho not in pai:
+                    pai[vizinho] = no_atual
+                    fila.append(vizinho)
+
         return []
         
     def distancia_manhattan(self, no1, no2):
@@ -201,10 +349,17 @@ def gerar_grafo_labirinto_com_biomas(tamanho_min=config.MAPA_TAMANHO_MIN,
         maze_grid, valid_positions = gerar_labirinto_conectado(new_width, new_height, seed)
         largura, altura = new_width, new_height
     
-    # 2. Gera biomas para toda a área
-    biome_map, biome_stats = gerar_biomas_naturais(
-        largura, altura, seed=seed, scale=scale_biomas, octaves=config.BIOMA_OITAVAS
-    )
+    # 2. Gera biomas — apenas para as células do labirinto quando ele é
+    # esparso (<60% do retângulo), evitando ruído nas paredes
+    esparso = len(valid_positions) * 5 < largura * altura * 3
+    if esparso:
+        biome_map, biome_stats = gerar_biomas_para_posicoes(
+            valid_positions, seed=seed, scale=scale_biomas, octaves=config.BIOMA_OITAVAS
+        )
+    else:
+        biome_map, biome_stats = gerar_biomas_naturais(
+            largura, altura, seed=seed, scale=scale_biomas, octaves=config.BIOMA_OITAVAS
+        )
     
     print(f"Biomas gerados:")
     for terrain, percentage in biome_stats['percentages'].items():
@@ -216,24 +371,34 @@ def gerar_grafo_labirinto_com_biomas(tamanho_min=config.MAPA_TAMANHO_MIN,
     grafo.biome_map = biome_map
     
     for x, y in valid_positions:
-        tipo_terreno = biome_map[y][x]
+        tipo_terreno = biome_map[(x, y)] if esparso else biome_map[y][x]
         grafo.adicionar_no(x, y, tipo_terreno)
     
-    # 4. Conecta nós adjacentes (4-conectividade dentro do labirinto)
+    # 4. Conecta nós adjacentes (4-conectividade dentro do labirinto).
+    # Passe único de construção em lote: escreve direto nos dicionários
+    # de adjacência com o custo já materializado em cada nó, sem pagar a
+    # validação e a invalidação de cache por aresta de conectar_nos. O
+    # conjunto de pares criados deduplica em O(1) por aresta
+    posicoes_validas = set(valid_positions)
+    arestas_criadas = set()
+    adjacencias = grafo.adjacencias
+    nos = grafo.nos
+
     for x, y in valid_positions:
-        no_atual = grafo.obter_no(x, y)
-        
+        no_atual = nos[(y << 16) | x]
+
         # Verifica vizinhos nas 4 direções
         for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
             nx, ny = x + dx, y + dy
-            
+
             # Só conecta se vizinho também está no labirinto
-            if (nx, ny) in valid_positions:
-                vizinho = grafo.obter_no(nx, ny)
-                if vizinho:
-                    vizinhos_existentes = {n for n, _ in grafo.obter_vizinhos(no_atual)}
-                    if vizinho not in vizinhos_existentes:
-                        grafo.conectar_nos(no_atual, vizinho)
+            if (nx, ny) in posicoes_validas:
+                aresta = ((x, y), (nx, ny)) if (x, y) <= (nx, ny) else ((nx, ny), (x, y))
+                if aresta not in arestas_criadas:
+                    arestas_criadas.add(aresta)
+                    vizinho = nos[(ny << 16) | nx]
+                    adjacencias[no_atual][vizinho] = vizinho.custo
+                    adjacencias[vizinho][no_atual] = no_atual.custo
     
     # 5. Escolhe pontos inicial e final aleatórios
     inicio_pos = random.choice(valid_positions)
@@ -284,15 +449,20 @@ def distribuir_recompensas_inteligentes(grafo, caminho_garantido, num_total):
     candidatos_caminho = caminho_garantido[1:-1]  # Exclui início e fim
     
     if len(candidatos_caminho) >= num_caminho:
-        # Distribui uniformemente ao longo do caminho
-        step = len(candidatos_caminho) // num_caminho
-        recompensas_caminho = [candidatos_caminho[i * step] for i in range(num_caminho)]
+        # Distribui uniformemente ao longo do caminho, incluindo as duas
+        # pontas — o passo inteiro truncado concentrava tudo no início
+        ultimo = len(candidatos_caminho) - 1
+        if num_caminho == 1:
+            indices = [0]
+        else:
+            indices = sorted({int(i * ultimo / (num_caminho - 1)) for i in range(num_caminho)})
+        recompensas_caminho = [candidatos_caminho[i] for i in indices]
     else:
         # Se caminho é muito curto, usa todos os candidatos
         recompensas_caminho = candidatos_caminho
     
     for no in recompensas_caminho:
-        no.tem_recompensa = True
+        grafo.definir_recompensa(no)
     
     grafo.recompensas_caminho_principal = recompensas_caminho
     
@@ -300,11 +470,28 @@ def distribuir_recompensas_inteligentes(grafo, caminho_garantido, num_total):
     num_extras = num_total - len(recompensas_caminho)
     
     if num_extras > 0 and nos_fora_caminho:
-        # Prioriza nós que estão a uma distância razoável do caminho (não muito longe)
+        # Prioriza nós que estão a uma distância razoável do caminho (não muito longe).
+        # Uma única BFS multi-origem sobre as arestas reais do grafo, semeada
+        # por todo o caminho e limitada à profundidade 5, dá a distância
+        # topológica de cada nó até o caminho — diferente da Manhattan, ela
+        # respeita as paredes do labirinto
+        dist_caminho = {no_caminho: 0 for no_caminho in nos_caminho}
+        fila = deque(nos_caminho)
+
+        while fila:
+            no_atual = fila.popleft()
+            d = dist_caminho[no_atual]
+            if d >= 5:
+                continue
+            for vizinho, _ in grafo.obter_vizinhos(no_atual):
+                if vizinho not in dist_caminho:
+                    dist_caminho[vizinho] = d + 1
+                    fila.append(vizinho)
+
         candidatos_extras = []
         for no in nos_fora_caminho:
-            dist_min = min(grafo.distancia_manhattan(no, no_caminho) for no_caminho in nos_caminho)
-            if dist_min <= 5:  # Não muito longe do caminho principal
+            dist_min = dist_caminho.get(no)
+            if dist_min is not None:  # Não muito longe do caminho principal
                 candidatos_extras.append((no, dist_min))
         
         # Ordena por distância e pega os melhores
@@ -315,14 +502,14 @@ def distribuir_recompensas_inteligentes(grafo, caminho_garantido, num_total):
         
         # Se ainda faltam recompensas, pega aleatoriamente dos restantes
         if num_candidatos < num_extras:
-            restantes = [no for no in nos_fora_caminho 
-                        if no not in [c[0] for c in candidatos_extras[:num_candidatos]]]
+            escolhidos = {c[0] for c in candidatos_extras[:num_candidatos]}
+            restantes = [no for no in nos_fora_caminho if no not in escolhidos]
             extras_aleatorias = random.sample(restantes, 
                                            min(num_extras - num_candidatos, len(restantes)))
             recompensas_extras.extend(extras_aleatorias)
         
         for no in recompensas_extras:
-            no.tem_recompensa = True
+            grafo.definir_recompensa(no)
             
         grafo.recompensas_areas_extras = recompensas_extras
     
@@ -365,34 +552,37 @@ def _gerar_grafo_basico_conectado(largura, altura, seed=None):
     rng = random.Random(seed)
     grafo = Graph()
 
+    # Sorteia o terreno de todas as células numa única chamada (cascata
+    # de comparações por célula vira uma amostragem ponderada em C)
+    tipos = (TipoTerreno.SOLIDO, TipoTerreno.ARENOSO,
+             TipoTerreno.ROCHOSO, TipoTerreno.PANTANO)
+    sorteio = iter(rng.choices(tipos, weights=(0.4, 0.2, 0.2, 0.2),
+                               k=largura * altura))
+
     for y in range(altura):
         for x in range(largura):
-            rand = rng.random()
-            if rand < 0.4:
-                tipo = TipoTerreno.SOLIDO
-            elif rand < 0.6:
-                tipo = TipoTerreno.ARENOSO
-            elif rand < 0.8:
-                tipo = TipoTerreno.ROCHOSO
-            else:
-                tipo = TipoTerreno.PANTANO
-
-            grafo.adicionar_no(x, y, tipo)
+            grafo.adicionar_no(x, y, next(sorteio))
 
+    # Mesmo passe em lote da construção do labirinto: escrita direta nos
+    # dicionários de adjacência, nas duas direções, sem conectar_nos
+    adjacencias = grafo.adjacencias
+    nos = grafo.nos
     for y in range(altura):
         for x in range(largura):
-            no_atual = grafo.obter_no(x, y)
+            no_atual = nos[(y << 16) | x]
+            custo_atual = no_atual.custo
+            vizinhos_atual = adjacencias[no_atual]
             for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < largura and 0 <= ny < altura:
-                    vizinho = grafo.obter_no(nx, ny)
-                    if vizinho:
-                        grafo.conectar_nos(no_atual, vizinho)
+                    vizinho = nos[(ny << 16) | nx]
+                    vizinhos_atual[vizinho] = vizinho.custo
+                    adjacencias[vizinho][no_atual] = custo_atual
 
     nos_disponiveis = grafo.obter_todos_nos()
     num_recompensas = max(5, len(nos_disponiveis) // 6)
     for no in rng.sample(nos_disponiveis, num_recompensas):
-        no.tem_recompensa = True
+        grafo.definir_recompensa(no)
 
     return grafo
 
@@ -3,10 +3,18 @@ Gerador de labirintos usando algoritmo DFS recursivo.
 Cria estruturas labirínticas conectadas para servir de base para o grafo.
 """
 
+import itertools
 import random
 from collections import deque
 
 
+# Direções de escavação (passos de 2 células): Norte, Leste, Sul, Oeste.
+# As 24 permutações possíveis são pré-computadas para que cada célula do
+# DFS faça um único sorteio de índice em vez das 3 trocas do shuffle
+_DIRECOES = ((0, 2), (2, 0), (0, -2), (-2, 0))
+_PERMUTACOES_DIRECOES = tuple(itertools.permutations(_DIRECOES))
+
+
 class MazeGenerator:
     """Gera labirintos usando DFS recursivo"""
     
@@ -16,26 +24,28 @@ class MazeGenerator:
         if seed is not None:
             random.seed(seed)
         
-        # Grid inicializado com paredes (True = parede, False = caminho)
-        self.grid = [[True for _ in range(width)] for _ in range(height)]
+        # Grid inicializado com paredes (1 = parede, 0 = caminho).
+        # Linhas em bytearray: 1 byte por célula, contíguo e sem um
+        # objeto bool por posição
+        self.grid = [bytearray([1] * width) for _ in range(height)]
         
     def generate(self):
         """
         Gera labirinto usando algoritmo DFS recursivo
         
         Returns:
-            list[list[bool]]: Grid onde True = parede, False = caminho
+            list[bytearray]: Grid onde 1 = parede, 0 = caminho
         """
         # Certifica que dimensões são ímpares para algoritmo funcionar
         actual_width = self.width if self.width % 2 == 1 else self.width - 1
         actual_height = self.height if self.height % 2 == 1 else self.height - 1
-        
+
         # Reinicializa grid com dimensões corretas
-        self.grid = [[True for _ in range(actual_width)] for _ in range(actual_height)]
-        
+        self.grid = [bytearray([1] * actual_width) for _ in range(actual_height)]
+
         # Começa do canto superior esquerdo (posição ímpar)
         start_x, start_y = 1, 1
-        self.grid[start_y][start_x] = False
+        self.grid[start_y][start_x] = 0
         
         # DFS recursivo
         self._dfs_carve(start_x, start_y, actual_width, actual_height)
@@ -50,87 +60,142 @@ class MazeGenerator:
         return self.grid
     
     def _dfs_carve(self, x, y, width, height):
-        """Algoritmo DFS recursivo para escavar caminhos"""
-        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]  # Norte, Leste, Sul, Oeste
-        random.shuffle(directions)
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            
-            # Verifica se nova posição é válida e ainda é parede
-            if (0 < nx < width - 1 and 0 < ny < height - 1 and 
-                self.grid[ny][nx] == True):
-                
-                # Remove parede entre posição atual e nova posição
-                wall_x, wall_y = x + dx // 2, y + dy // 2
-                self.grid[wall_y][wall_x] = False
-                self.grid[ny][nx] = False
-                
-                # Recursão
-                self._dfs_carve(nx, ny, width, height)
+        """
+        Algoritmo DFS para escavar caminhos (pilha explícita)
+
+        A versão iterativa elimina o limite de recursão do Python e o
+        custo de um frame por célula, visitando as células na mesma ordem
+        que a forma recursiva visitaria para uma dada sequência de
+        direções sorteadas. O consumo do gerador aleatório é diferente
+        do original (um sorteio de permutação por célula em vez do
+        shuffle), então labirintos de sementes antigas mudam.
+        """
+        grid = self.grid
+        randrange = random.randrange
+        permutacoes = _PERMUTACOES_DIRECOES
+
+        pilha = [(x, y, iter(permutacoes[randrange(24)]))]
+
+        while pilha:
+            cx, cy, direcoes = pilha[-1]
+
+            for dx, dy in direcoes:
+                nx, ny = cx + dx, cy + dy
+
+                # Verifica se nova posição é válida e ainda é parede
+                if (0 < nx < width - 1 and 0 < ny < height - 1 and
+                        grid[ny][nx]):
+
+                    # Remove parede entre posição atual e nova posição
+                    grid[cy + dy // 2][cx + dx // 2] = 0
+                    grid[ny][nx] = 0
+
+                    # "Recursão": empilha a nova célula com direções próprias
+                    pilha.append((nx, ny, iter(permutacoes[randrange(24)])))
+                    break
+            else:
+                pilha.pop()
     
     def _ensure_connectivity(self, width, height):
-        """Garante que todo o labirinto está conectado usando flood fill"""
-        # Encontra primeira célula de caminho
-        start_pos = None
-        for y in range(height):
-            for x in range(width):
-                if not self.grid[y][x]:  # Se é caminho
-                    start_pos = (x, y)
-                    break
-            if start_pos:
-                break
-        
-        if not start_pos:
+        """Garante que todo o labirinto está conectado rotulando componentes"""
+        # Rotula todos os componentes conexos em uma única varredura
+        # (versão em Python puro do label() do scipy.ndimage): cada célula
+        # de caminho recebe o número do seu componente, e a fusão acontece
+        # por componente em vez de uma sondagem por célula isolada.
+        # O buffer de marcação é um único bytearray com indexação linear
+        # y*width + x: memória contígua e uma só indexação por acesso,
+        # sem a lista de listas com um objeto por célula
+        rotulado = bytearray(width * height)
+        componentes = []  # células de cada componente, na ordem de varredura
+
+        # Locais para o laço quente: LOAD_FAST em vez de LOAD_ATTR a cada
+        # acesso a self.grid e a cada método de fila
+        grid = self.grid
+
+        for y0 in range(height):
+            for x0 in range(width):
+                if grid[y0][x0] or rotulado[y0 * width + x0]:
+                    continue
+                celulas = [(x0, y0)]
+                rotulado[y0 * width + x0] = 1
+                queue = deque(celulas)
+                popleft = queue.popleft
+                enfileirar = queue.append
+                while queue:
+                    x, y = popleft()
+                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                        nx, ny = x + dx, y + dy
+                        if (0 <= nx < width and 0 <= ny < height and
+                                not grid[ny][nx] and
+                                not rotulado[ny * width + nx]):
+                            rotulado[ny * width + nx] = 1
+                            celulas.append((nx, ny))
+                            enfileirar((nx, ny))
+                componentes.append(celulas)
+
+        if not componentes:
             # Sem caminhos, cria um básico
-            self.grid[1][1] = False
+            self.grid[1][1] = 0
             return
-        
-        # Flood fill para marcar área conectada
-        visited = [[False for _ in range(width)] for _ in range(height)]
-        queue = deque([start_pos])
-        visited[start_pos[1]][start_pos[0]] = True
-        
-        while queue:
-            x, y = queue.popleft()
-            
+
+        if len(componentes) == 1:
+            return
+
+        # Área principal é o primeiro componente; os demais são fundidos
+        # a ela um a um, marcando o componente inteiro como conectado
+        # assim que uma passagem é escavada. Mesmo buffer plano aqui
+        visited = bytearray(width * height)
+        for x, y in componentes[0]:
+            visited[y * width + x] = 1
+
+        for celulas in componentes[1:]:
+            self._connect_to_main_area(celulas, visited, width, height)
+            for x, y in celulas:
+                visited[y * width + x] = 1
+
+    def _connect_to_main_area(self, celulas, visited, width, height):
+        """Conecta área isolada à área principal"""
+        # BFS multi-origem a partir do componente isolado, atravessando
+        # paredes com ponteiros de pai: encontra a cadeia de paredes mais
+        # curta até a área principal e escava só ela. Uma frente de onda
+        # O(W·H) no total, contra a sondagem linear por direção que era
+        # O(W·H·max(W,H)) no pior caso
+        grid = self.grid
+        pai = {}
+        fila = deque()
+        for celula in celulas:
+            pai[celula] = None
+            fila.append(celula)
+        popleft = fila.popleft
+        enfileirar = fila.append
+
+        while fila:
+            x, y = popleft()
             for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
                 nx, ny = x + dx, y + dy
-                
-                if (0 <= nx < width and 0 <= ny < height and
-                    not visited[ny][nx] and not self.grid[ny][nx]):
-                    visited[ny][nx] = True
-                    queue.append((nx, ny))
-        
-        # Conecta áreas desconectadas criando passagens
-        for y in range(1, height - 1):
-            for x in range(1, width - 1):
-                if not self.grid[y][x] and not visited[y][x]:
-                    # Encontra caminho mais próximo e conecta
-                    self._connect_to_main_area(x, y, visited, width, height)
-    
-    def _connect_to_main_area(self, x, y, visited, width, height):
-        """Conecta área isolada à área principal"""
-        # Busca direção para área conectada
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            for distance in range(1, max(width, height)):
-                nx, ny = x + dx * distance, y + dy * distance
-                
-                if (0 <= nx < width and 0 <= ny < height and
-                    not self.grid[ny][nx] and visited[ny][nx]):
-                    
-                    # Cria caminho até área conectada
-                    for i in range(1, distance):
-                        path_x = x + dx * i
-                        path_y = y + dy * i
-                        if 0 <= path_x < width and 0 <= path_y < height:
-                            self.grid[path_y][path_x] = False
-                            visited[path_y][path_x] = True
-                    return
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                vizinha = (nx, ny)
+                if vizinha in pai:
+                    continue
+                pai[vizinha] = (x, y)
+
+                if not grid[ny][nx] and visited[ny * width + nx]:
+                    # Alcançou a área principal: escava a cadeia de
+                    # paredes de volta até o componente isolado
+                    atual = (x, y)
+                    while atual is not None and grid[atual[1]][atual[0]]:
+                        grid[atual[1]][atual[0]] = 0
+                        visited[atual[1] * width + atual[0]] = 1
+                        atual = pai[atual]
+                    return True
+
+                enfileirar(vizinha)
+        return False
     
     def _resize_grid(self, old_width, old_height, new_width, new_height):
         """Redimensiona grid para tamanho desejado"""
-        new_grid = [[True for _ in range(new_width)] for _ in range(new_height)]
+        new_grid = [bytearray([1] * new_width) for _ in range(new_height)]
         
         # Copia grid antigo
         for y in range(min(old_height, new_height)):
@@ -150,17 +215,17 @@ class MazeGenerator:
             # Adiciona caminhos verticais na borda direita
             for y in range(1, min(new_h, old_h), 2):
                 if random.random() < 0.3:
-                    grid[y][old_w] = False
+                    grid[y][old_w] = 0
                     if old_w + 1 < new_w:
-                        grid[y][old_w + 1] = False
-        
+                        grid[y][old_w + 1] = 0
+
         if new_h > old_h:
             # Adiciona caminhos horizontais na borda inferior
             for x in range(1, min(new_w, old_w), 2):
                 if random.random() < 0.3:
-                    grid[old_h][x] = False
+                    grid[old_h][x] = 0
                     if old_h + 1 < new_h:
-                        grid[old_h + 1][x] = False
+                        grid[old_h + 1][x] = 0
     
     def get_valid_positions(self):
         """
@@ -169,12 +234,13 @@ class MazeGenerator:
         Returns:
             list[tuple[int, int]]: Lista de coordenadas (x, y) de caminhos
         """
-        positions = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if not self.grid[y][x]:  # Se é caminho (não parede)
-                    positions.append((x, y))
-        return positions
+        # Varre cada linha (bytearray) direto, sem indexação por range;
+        # o filtro roda dentro da list comprehension em vez de um append
+        # interpretado por célula
+        return [(x, y)
+                for y, row in enumerate(self.grid)
+                for x, cell in enumerate(row)
+                if not cell]
     
     def is_path(self, x, y):
         """Verifica se posição é caminho válido"""
@@ -198,7 +264,7 @@ def gerar_labirinto_conectado(width, height, seed=None):
         seed (int): Semente para reprodução
         
     Returns:
-        tuple: (grid, valid_positions) onde grid é matriz booleana e valid_positions são coordenadas de caminhos
+        tuple: (grid, valid_positions) onde grid é matriz 0/1 (1 = parede) e valid_positions são coordenadas de caminhos
     """
     generator = MazeGenerator(width, height, seed)
     grid = generator.generate()
@@ -11,8 +11,9 @@ import traceback
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from nucleo.graph import gerar_grafo_teste, TipoTerreno
 from nucleo.agent import Agent, AgentEstado  
-from algoritmos.search_algorithms import (busca_bfs, busca_dfs, busca_gulosa, 
-                              busca_a_estrela, executar_todos_algoritmos)
+from algoritmos.search_algorithms import (busca_bfs, busca_dfs, busca_gulosa,
+                              busca_a_estrela, busca_a_estrela_bidirecional,
+                              executar_todos_algoritmos)
 from algoritmos.heuristics import (distancia_manhattan, heuristica_combinada, 
                        limpar_cache_heuristicas)
 from utilitarios.visualization import (renderizar_mapa, validar_ambiente, obter_estatisticas_grafo,
@@ -20,6 +21,22 @@ from utilitarios.visualization import (renderizar_mapa, validar_ambiente, obter_
 from utilitarios.results import ResultadoComparativo
 
 
+# Grafos de teste compartilhados por dimensão: a construção completa
+# (labirinto, biomas, validação de conectividade) roda uma única vez por
+# combinação e os demais testes reutilizam o mesmo grafo, já que eles só
+# leem a estrutura ou mexem no estado de coleta das recompensas
+_grafos_teste = {}
+
+def obter_grafo_teste(tamanho_min=30, largura=8, altura=6):
+    """Retorna um grafo de teste em cache, com recompensas resetadas"""
+    chave = (tamanho_min, largura, altura)
+    if chave not in _grafos_teste:
+        _grafos_teste[chave] = gerar_grafo_teste(tamanho_min, largura, altura)
+    grafo = _grafos_teste[chave]
+    grafo.resetar_recompensas()
+    return grafo
+
+
 class TestRunner:
     """Classe para executar testes do sistema"""
     
@@ -62,7 +79,7 @@ class TestRunner:
 def testar_grafo():
     """Testa funcionalidades do módulo graph.py"""
     # Gera grafo
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     assert len(grafo.nos) >= 30, "Grafo deve ter pelo menos 30 nós"
     
     # Testa conectividade
@@ -81,7 +98,7 @@ def testar_grafo():
 
 def testar_agente():
     """Testa funcionalidades do módulo agent.py"""
-    grafo = gerar_grafo_teste(30, 6, 5)
+    grafo = obter_grafo_teste(30, 6, 5)
     no_inicial = grafo.obter_no(0, 0)
     no_objetivo = grafo.obter_no(5, 4)
     
@@ -103,7 +120,7 @@ def testar_agente():
 
 def testar_heuristicas():
     """Testa funcionalidades do módulo heuristics.py"""
-    grafo = gerar_grafo_teste(30, 6, 5)
+    grafo = obter_grafo_teste(30, 6, 5)
     no1 = grafo.obter_no(0, 0)
     no2 = grafo.obter_no(3, 4)
     
@@ -122,7 +139,7 @@ def testar_heuristicas():
 
 def testar_algoritmo_bfs():
     """Testa algoritmo BFS"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
     
     resultado = busca_bfs(grafo, no_inicial, no_objetivo)
@@ -136,7 +153,7 @@ def testar_algoritmo_bfs():
 
 def testar_algoritmo_dfs():
     """Testa algoritmo DFS"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
     
     resultado = busca_dfs(grafo, no_inicial, no_objetivo)
@@ -145,7 +162,7 @@ def testar_algoritmo_dfs():
 
 def testar_algoritmo_gulosa():
     """Testa algoritmo Gulosa"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
     
     resultado = busca_gulosa(grafo, no_inicial, no_objetivo)
@@ -154,16 +171,32 @@ def testar_algoritmo_gulosa():
 
 def testar_algoritmo_a_estrela():
     """Testa algoritmo A*"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
     
     resultado = busca_a_estrela(grafo, no_inicial, no_objetivo)
     assert resultado.nome_algoritmo == "A*", "Nome do algoritmo correto"
 
 
+def testar_algoritmo_a_estrela_bidirecional():
+    """Testa algoritmo A* bidirecional contra o A* unidirecional"""
+    grafo = obter_grafo_teste(30, 8, 6)
+    no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
+
+    resultado = busca_a_estrela_bidirecional(grafo, no_inicial, no_objetivo)
+    referencia = busca_a_estrela(grafo, no_inicial, no_objetivo)
+
+    assert resultado.nome_algoritmo == "A* Bidirecional", "Nome do algoritmo correto"
+    assert resultado.sucesso, "A* bidirecional deve encontrar caminho"
+    assert resultado.custo_total == referencia.custo_total, \
+        "Custo deve ser igual ao do A* unidirecional"
+    assert resultado.caminho_encontrado[0] == no_inicial, "Caminho deve começar no nó inicial"
+    assert resultado.caminho_encontrado[-1] == no_objetivo, "Caminho deve terminar no nó objetivo"
+
+
 def testar_execucao_completa():
     """Testa execução de todos os algoritmos"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     no_inicial, no_objetivo = escolher_nos_aleatorios(grafo)
     
     resultados = executar_todos_algoritmos(grafo, no_inicial, no_objetivo)
@@ -177,7 +210,7 @@ def testar_execucao_completa():
 
 def testar_utils():
     """Testa utilitários e visualização"""
-    grafo = gerar_grafo_teste(30, 8, 6)
+    grafo = obter_grafo_teste(30, 8, 6)
     
     # Testa renderização
     mapa = renderizar_mapa(grafo)
@@ -197,7 +230,7 @@ def testar_utils():
 def testar_results():
     """Testa sistema de resultados"""
     # Cria resultados simulados
-    from search_algorithms import ResultadoBusca
+    from algoritmos.search_algorithms import ResultadoBusca
     
     resultado1 = ResultadoBusca("BFS")
     resultado1.definir_resultado([], 25.0, 100, 0.05)
@@ -223,7 +256,7 @@ def testar_results():
 
 def testar_casos_extremos():
     """Testa casos extremos e edge cases"""
-    grafo = gerar_grafo_teste(30, 6, 5)
+    grafo = obter_grafo_teste(30, 6, 5)
     
     # Mesmo nó inicial e objetivo
     no = grafo.obter_no(0, 0)
@@ -249,6 +282,7 @@ def executar_teste_completo():
         ("Algoritmo DFS", testar_algoritmo_dfs),
         ("Algoritmo Gulosa", testar_algoritmo_gulosa),
         ("Algoritmo A*", testar_algoritmo_a_estrela),
+        ("Algoritmo A* Bidirecional", testar_algoritmo_a_estrela_bidirecional),
         ("Execução Completa", testar_execucao_completa),
         ("Módulo Utils", testar_utils),
         ("Módulo Results", testar_results),
@@ -14,11 +14,18 @@ class ResultadoComparativo:
         self.resultados = {}  # {nome_algoritmo: ResultadoBusca}
         self.ambiente_info = {}
         self.timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        
+
+        # Versão dos resultados para memoizar análises derivadas: cada
+        # adicionar_resultado invalida o que foi calculado antes
+        self._versao = 0
+        self._melhor_cache = None
+        self._melhor_cache_versao = -1
+
     def adicionar_resultado(self, resultado):
         """Adiciona resultado de um algoritmo"""
         if isinstance(resultado, ResultadoBusca):
             self.resultados[resultado.nome_algoritmo] = resultado
+            self._versao += 1
             
     def definir_info_ambiente(self, grafo, no_inicial, no_objetivo):
         """Define informações do ambiente testado"""
@@ -134,30 +141,36 @@ class ResultadoComparativo:
         if len(sucessos) > 1:
             linhas.append(f"\nANALISE DE EFICIENCIA:")
             linhas.append("-" * 30)
-            
-            # Melhor custo
-            melhor_custo = min(r.custo_total for r in sucessos.values())
-            algoritmo_melhor_custo = [nome for nome, r in sucessos.items() 
-                                    if r.custo_total == melhor_custo][0]
+
+            # Um único passe sobre os sucessos resolve os quatro "argmin"
+            # de uma vez, em vez de um min() + list comprehension por
+            # métrica; a comparação estrita mantém o primeiro em caso de
+            # empate, como antes
+            itens = iter(sucessos.items())
+            nome, r = next(itens)
+            melhor_custo, algoritmo_melhor_custo = r.custo_total, nome
+            melhor_tempo, algoritmo_melhor_tempo = r.tempo_execucao, nome
+            menos_nos, algoritmo_menos_nos = r.nos_expandidos, nome
+            mais_recompensas = len(r.recompensas_no_caminho)
+            algoritmo_mais_recompensas = nome
+
+            for nome, r in itens:
+                if r.custo_total < melhor_custo:
+                    melhor_custo, algoritmo_melhor_custo = r.custo_total, nome
+                if r.tempo_execucao < melhor_tempo:
+                    melhor_tempo, algoritmo_melhor_tempo = r.tempo_execucao, nome
+                if r.nos_expandidos < menos_nos:
+                    menos_nos, algoritmo_menos_nos = r.nos_expandidos, nome
+                num_recompensas = len(r.recompensas_no_caminho)
+                if num_recompensas > mais_recompensas:
+                    mais_recompensas = num_recompensas
+                    algoritmo_mais_recompensas = nome
+
             linhas.append(f"Melhor solução: {algoritmo_melhor_custo} (custo {melhor_custo:.1f})")
-            
-            # Mais eficiente em tempo
-            melhor_tempo = min(r.tempo_execucao for r in sucessos.values())
-            algoritmo_melhor_tempo = [nome for nome, r in sucessos.items() 
-                                    if r.tempo_execucao == melhor_tempo][0]
             linhas.append(f"Mais rápido: {algoritmo_melhor_tempo} ({melhor_tempo:.3f}s)")
-            
-            # Menos nós expandidos
-            menos_nos = min(r.nos_expandidos for r in sucessos.values())
-            algoritmo_menos_nos = [nome for nome, r in sucessos.items() 
-                                 if r.nos_expandidos == menos_nos][0]
             linhas.append(f"Mais eficiente: {algoritmo_menos_nos} ({menos_nos} nós)")
-            
-            # Mais recompensas
-            if any(len(r.recompensas_no_caminho) > 0 for r in sucessos.values()):
-                mais_recompensas = max(len(r.recompensas_no_caminho) for r in sucessos.values())
-                algoritmo_mais_recompensas = [nome for nome, r in sucessos.items() 
-                                            if len(r.recompensas_no_caminho) == mais_recompensas][0]
+
+            if mais_recompensas > 0:
                 linhas.append(f"Mais recompensas: {algoritmo_mais_recompensas} ({mais_recompensas})")
         
         linhas.append("\n" + "=" * 60)
@@ -188,10 +201,22 @@ class ResultadoComparativo:
         
         # Qualidade da solução
         if len(sucessos) > 1:
-            melhor_custo = min(r.custo_total for r in sucessos.values())
-            algoritmos_otimos = [nome for nome, r in sucessos.items() 
-                               if abs(r.custo_total - melhor_custo) < 0.1]
-            
+            # Passe único: mantém o menor custo visto e os empatados
+            # (diferença < 0.1); um novo mínimo refiltra os candidatos
+            # já aceitos em vez de varrer tudo de novo
+            melhor_custo = float('inf')
+            candidatos = []
+            for nome, r in sucessos.items():
+                custo = r.custo_total
+                if custo < melhor_custo:
+                    melhor_custo = custo
+                    candidatos = [(n, c) for n, c in candidatos
+                                  if abs(c - custo) < 0.1]
+                    candidatos.append((nome, custo))
+                elif abs(custo - melhor_custo) < 0.1:
+                    candidatos.append((nome, custo))
+
+            algoritmos_otimos = [nome for nome, _ in candidatos]
             linhas.append(f"- Melhor qualidade: {', '.join(algoritmos_otimos)}")
         
         # Velocidade
@@ -235,15 +260,18 @@ class ResultadoComparativo:
             nome_arquivo (str): Nome do arquivo de saída
         """
         try:
+            # Monta o relatório inteiro em memória e grava numa única
+            # escrita, em vez de sete f.write intercalados
+            partes = [
+                "RELATÓRIO DE ALGORITMOS DE BUSCA\n"
+                "Generated by: Sistemas de Busca v1.0\n",
+                self.gerar_tabela_comparativa(),
+                self.gerar_analise_detalhada(),
+                self.gerar_recomendacoes(),
+                "\n--- FIM DO RELATÓRIO ---",
+            ]
             with open(nome_arquivo, 'w', encoding='utf-8') as f:
-                f.write("RELATÓRIO DE ALGORITMOS DE BUSCA\n")
-                f.write("Generated by: Sistemas de Busca v1.0\n\n")
-                f.write(self.gerar_tabela_comparativa())
-                f.write("\n")
-                f.write(self.gerar_analise_detalhada())
-                f.write("\n")
-                f.write(self.gerar_recomendacoes())
-                f.write("\n\n--- FIM DO RELATÓRIO ---")
+                f.write("\n".join(partes))
             
             print(f"[OK] Relatorio salvo em: {nome_arquivo}")
             return True
@@ -258,9 +286,16 @@ class ResultadoComparativo:
         Returns:
             str: Nome do melhor algoritmo
         """
+        # Memoizado pela versão dos resultados: chamadas repetidas sem
+        # novos resultados não refazem a normalização dos scores
+        if self._melhor_cache_versao == self._versao:
+            return self._melhor_cache
+
         sucessos = {k: v for k, v in self.resultados.items() if v.sucesso}
-        
+
         if not sucessos:
+            self._melhor_cache = None
+            self._melhor_cache_versao = self._versao
             return None
             
         # Score baseado em múltiplos fatores
@@ -291,7 +326,9 @@ class ResultadoComparativo:
             scores[nome] = score_total
         
         # Retorna algoritmo com menor score (melhor)
-        return min(scores.items(), key=lambda x: x[1])[0]
+        self._melhor_cache = min(scores.items(), key=lambda x: x[1])[0]
+        self._melhor_cache_versao = self._versao
+        return self._melhor_cache
 
 
 # Funções utilitárias para análise rápida
@@ -3,15 +3,52 @@ Módulo responsável pelas utilidades, visualização e funções auxiliares.
 Renderização do ambiente, simulação de movimento e geração de ambientes.
 """
 
+import sys
 import time
-import os
 import random
+from collections import Counter
+
+
 from nucleo.graph import Graph, TipoTerreno, gerar_grafo_labirinto_com_biomas
 
 
+# Sequência ANSI que limpa a tela e volta o cursor ao topo: alguns bytes
+# no terminal no lugar de os.system('cls'/'clear'), que criava um
+# processo novo a cada chamada. Suportada nos terminais modernos do
+# Windows (10+) e em qualquer terminal Unix
+_ANSI_LIMPAR_TELA = "\x1b[2J\x1b[H"
+
+
 def limpar_console():
-    """Limpa o console de forma compatível com Windows e Linux"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Limpa o console sem criar processo, via sequência ANSI"""
+    sys.stdout.write(_ANSI_LIMPAR_TELA)
+    sys.stdout.flush()
+
+
+# Cabeçalho de colunas e prefixos de linha por dimensão: só dependem do
+# tamanho do grafo, então são formatados uma vez e reaproveitados entre
+# renderizações (a simulação renderiza um quadro por passo do caminho)
+_cache_cabecalho = {}
+_cache_prefixos_linha = {}
+
+
+def _obter_cabecalho(largura):
+    """Retorna (linha de números, linha separadora) para a largura dada"""
+    cabecalho = _cache_cabecalho.get(largura)
+    if cabecalho is None:
+        cabecalho = ("   " + "".join(f"{i:2}" for i in range(largura)),
+                     "   " + "--" * largura)
+        _cache_cabecalho[largura] = cabecalho
+    return cabecalho
+
+
+def _obter_prefixos_linha(altura):
+    """Retorna a lista de prefixos 'yy|' para a altura dada"""
+    prefixos = _cache_prefixos_linha.get(altura)
+    if prefixos is None:
+        prefixos = [f"{y:2}|" for y in range(altura)]
+        _cache_prefixos_linha[altura] = prefixos
+    return prefixos
 
 
 def renderizar_mapa(grafo, agente=None, caminho=None, destacar_nos=None):
@@ -30,17 +67,12 @@ def renderizar_mapa(grafo, agente=None, caminho=None, destacar_nos=None):
     if not grafo.nos:
         return "Grafo vazio"
     
-    # Cria matriz para renderização
-    matriz = []
-    for y in range(grafo.altura):
-        linha = []
-        for x in range(grafo.largura):
-            no = grafo.obter_no(x, y)
-            if no:
-                linha.append(no.obter_simbolo())
-            else:
-                linha.append('#')  # Parede (nó inexistente)
-        matriz.append(linha)
+    # Matriz pré-preenchida com paredes ('#' = nó inexistente); um único
+    # passe sobre os nós existentes substitui as largura·altura consultas
+    # obter_no — células sem nó nem chegam a ser visitadas
+    matriz = [['#'] * grafo.largura for _ in range(grafo.altura)]
+    for no in grafo.nos.values():
+        matriz[no.y][no.x] = no.obter_simbolo()
     
     # Marca caminho se fornecido
     if caminho:
@@ -75,15 +107,14 @@ def renderizar_mapa(grafo, agente=None, caminho=None, destacar_nos=None):
         for no in destacar_nos:
             matriz[no.y][no.x] = '+'  # Destaque especial
     
-    # Constrói string de saída
-    resultado = []
-    resultado.append("   " + "".join(f"{i:2}" for i in range(grafo.largura)))
-    resultado.append("   " + "--" * grafo.largura)
-    
+    # Constrói string de saída com o cabeçalho e os prefixos em cache
+    linha_numeros, linha_separadora = _obter_cabecalho(grafo.largura)
+    resultado = [linha_numeros, linha_separadora]
+
+    prefixos = _obter_prefixos_linha(grafo.altura)
     for y, linha in enumerate(matriz):
-        linha_str = f"{y:2}|" + " ".join(f"{celula}" for celula in linha)
-        resultado.append(linha_str)
-    
+        resultado.append(prefixos[y] + " ".join(linha))
+
     return "\n".join(resultado)
 
 
@@ -138,32 +169,31 @@ def simular_movimento(grafo, agente, caminho, velocidade=1.0, mostrar_stats=True
     agente.resetar_estado()
     
     for i, no in enumerate(caminho):
-        limpar_console()
-        
         # Atualiza posição do agente
         if i > 0:
             no_anterior = caminho[i-1]
-            # Encontra custo do movimento
-            custo_movimento = 0
-            for vizinho, custo in grafo.obter_vizinhos(no_anterior):
-                if vizinho == no:
-                    custo_movimento = custo
-                    break
+            # Custo do movimento em O(1) no dicionário de adjacência,
+            # em vez de varrer a lista de vizinhos a cada passo
+            custo_movimento = grafo.obter_vizinhos_dict(no_anterior).get(no, 0)
             agente.mover_para(no, custo_movimento)
-        
-        # Renderiza estado atual
-        print(f"PASSO {i+1}/{len(caminho)}")
-        print(renderizar_mapa(grafo, agente, caminho))
-        
+
+        # Monta o quadro inteiro (mapa + estatísticas) e emite numa única
+        # escrita, limpando a tela com ANSI: um write/flush por passo
+        partes = [f"PASSO {i+1}/{len(caminho)}",
+                  renderizar_mapa(grafo, agente, caminho)]
+
         if mostrar_stats:
-            print(f"\nPosição: ({no.x}, {no.y}) - Terreno: {no.tipo_terreno.name}")
-            print(f"Custo Acumulado: {agente.custo_acumulado}")
-            print(f"Recompensas Coletadas: {len(agente.recompensas_coletadas)}")
-            
+            partes.append(f"\nPosição: ({no.x}, {no.y}) - Terreno: {no.tipo_terreno.name}")
+            partes.append(f"Custo Acumulado: {agente.custo_acumulado}")
+            partes.append(f"Recompensas Coletadas: {len(agente.recompensas_coletadas)}")
+
             if agente.recompensas_coletadas:
                 recompensas_pos = [(r.x, r.y) for r in agente.recompensas_coletadas]
-                print(f"Posições das Recompensas: {recompensas_pos}")
-        
+                partes.append(f"Posições das Recompensas: {recompensas_pos}")
+
+        sys.stdout.write(_ANSI_LIMPAR_TELA + "\n".join(partes) + "\n")
+        sys.stdout.flush()
+
         # Pausa para animação
         if i < len(caminho) - 1:  # Não pausa no último passo
             time.sleep(velocidade)
@@ -194,37 +224,36 @@ def gerar_ambiente_personalizado(largura=8, altura=6, densidade_terreno=None):
         }
     
     grafo = Graph()
-    
-    # Gera nós com distribuição personalizada
+
+    # Sorteia o terreno de todas as células numa única chamada ponderada,
+    # como no gerador básico de grafos: a varredura cumulativa por célula
+    # vira uma amostragem em lote feita em C
+    tipos = list(densidade_terreno.keys())
+    pesos = list(densidade_terreno.values())
+    sorteio = iter(random.choices(tipos, weights=pesos, k=largura * altura))
+
     for y in range(altura):
         for x in range(largura):
-            # Escolhe terreno baseado nas probabilidades
-            rand = random.random()
-            soma_prob = 0
-            tipo_escolhido = TipoTerreno.SOLIDO
-            
-            for tipo, prob in densidade_terreno.items():
-                soma_prob += prob
-                if rand <= soma_prob:
-                    tipo_escolhido = tipo
-                    break
-            
-            grafo.adicionar_no(x, y, tipo_escolhido)
-    
-    # Conecta nós (4-conectividade)
+            grafo.adicionar_no(x, y, next(sorteio))
+    
+    # Conecta nós (4-conectividade) no mesmo passe em lote dos geradores
+    # de graph.py: a grade é densa, então os nós são indexados direto por
+    # posição (ordem de inserção é linha a linha) e as arestas escritas
+    # nos dicionários de adjacência sem as validações de conectar_nos
+    adjacencias = grafo.adjacencias
+    nos_grade = grafo.obter_todos_nos()
     for y in range(altura):
+        base = y * largura
         for x in range(largura):
-            no_atual = grafo.obter_no(x, y)
-            if not no_atual:
-                continue
-                
-            # Conecta com vizinhos adjacentes
+            no_atual = nos_grade[base + x]
+            custo_atual = no_atual.custo
+            vizinhos_atual = adjacencias[no_atual]
             for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
                 novo_x, novo_y = x + dx, y + dy
                 if 0 <= novo_x < largura and 0 <= novo_y < altura:
-                    vizinho = grafo.obter_no(novo_x, novo_y)
-                    if vizinho:
-                        grafo.conectar_nos(no_atual, vizinho)
+                    vizinho = nos_grade[novo_y * largura + novo_x]
+                    vizinhos_atual[vizinho] = vizinho.custo
+                    adjacencias[vizinho][no_atual] = custo_atual
     
     return grafo
 
@@ -246,8 +275,8 @@ def distribuir_recompensas_estrategicas(grafo, num_recompensas=5):
         num_recompensas = len(todos_nos)
     
     # Evita colocar recompensas em terrenos muito caros
-    nos_validos = [no for no in todos_nos 
-                   if no.tipo_terreno.custo <= TipoTerreno.ROCHOSO.custo]
+    custo_maximo = TipoTerreno.ROCHOSO.custo
+    nos_validos = [no for no in todos_nos if no.custo <= custo_maximo]
     
     if len(nos_validos) < num_recompensas:
         nos_validos = todos_nos
@@ -256,8 +285,8 @@ def distribuir_recompensas_estrategicas(grafo, num_recompensas=5):
     nos_recompensa = random.sample(nos_validos, num_recompensas)
     
     for no in nos_recompensa:
-        no.tem_recompensa = True
-    
+        grafo.definir_recompensa(no)
+
     return nos_recompensa
 
 
@@ -318,20 +347,19 @@ def obter_estatisticas_grafo(grafo):
     if not grafo.nos:
         return {"erro": "Grafo vazio"}
     
-    # Conta tipos de terreno
-    contagem_terrenos = {}
-    for terreno in TipoTerreno:
-        contagem_terrenos[terreno.name] = 0
-    
-    for no in grafo.nos.values():
-        contagem_terrenos[no.tipo_terreno.name] += 1
+    # Conta tipos de terreno num único passe em C (Counter consome o
+    # generator sem incremento interpretado por nó), preenchendo com zero
+    # os tipos ausentes
+    contagem = Counter(no.tipo_terreno.name for no in grafo.nos.values())
+    contagem_terrenos = {terreno.name: contagem.get(terreno.name, 0)
+                         for terreno in TipoTerreno}
     
     # Calcula outras métricas
     total_nos = len(grafo.nos)
     recompensas = len(grafo.obter_nos_com_recompensa())
     
     # Calcula custo médio
-    custo_total = sum(no.tipo_terreno.custo for no in grafo.nos.values())
+    custo_total = sum(no.custo for no in grafo.nos.values())
     custo_medio = custo_total / total_nos if total_nos > 0 else 0
     
     return {
@@ -364,12 +392,11 @@ def escolher_nos_aleatorios(grafo, evitar_recompensas=True):
     
     if len(todos_nos) < 2:
         return None, None
-    
-    # Escolhe dois nós diferentes
-    no_inicial = random.choice(todos_nos)
-    nos_restantes = [no for no in todos_nos if no != no_inicial]
-    no_objetivo = random.choice(nos_restantes)
-    
+
+    # Escolhe dois nós diferentes num único sorteio sem reposição,
+    # sem a cópia O(N) da lista para excluir o nó inicial
+    no_inicial, no_objetivo = random.sample(todos_nos, 2)
+
     return no_inicial, no_objetivo
 
 